@@ -6,12 +6,21 @@ from flask import Flask, send_from_directory, request, jsonify
 from langchain_core.prompts import PromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
 from scripts.runnner import run_all
+from scripts.time_rollup import ROLLUP_DIMENSIONS, ROLLUP_FILE, RATING_HISTOGRAM_FILE, query_time_rollup
 
 load_dotenv()
 
 UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# When set, /analyze appends uploads to this store instead of
+# reprocessing the full history every time.
+INCREMENTAL_STATE_DIR = os.getenv("INCREMENTAL_STATE_DIR")
+
+# Where run_all exports its report files (report_data.json for the
+# quantitative report page, multi-tier JSON, top quotes CSV).
+EXPORT_DIR = os.getenv("EXPORT_DIR", ".")
+
 app = Flask(__name__)
 
 
@@ -23,7 +32,7 @@ def generate_restaurant_summary(INPUT_CSV):
     # -------------------
     # RUN ANALYSIS
     # -------------------
-    analysis_results = run_all(INPUT_CSV)
+    analysis_results = run_all(INPUT_CSV, state_dir=INCREMENTAL_STATE_DIR, export_dir=EXPORT_DIR)
 
     llm = ChatGoogleGenerativeAI(
         model="gemini-3-flash-preview",
@@ -236,6 +245,41 @@ def upload():
 @app.route("/report")
 def report():
     return send_from_directory("./frontend", "quantitative_report_template.html")
+@app.route("/rollup")
+def rollup():
+    # time window / dimension queries over the cube saved by the last run,
+    # e.g. /rollup?freq=W&by=city&start=2024-01-01&end=2024-03-31&city=Pune
+    rollup_path = os.path.join(EXPORT_DIR, ROLLUP_FILE)
+    if not os.path.exists(rollup_path):
+        return jsonify({"error": "No analysis has been run yet"}), 404
+    # medians only when the run also saved the rating histogram
+    histogram_path = os.path.join(EXPORT_DIR, RATING_HISTOGRAM_FILE)
+
+    by = [dim for dim in request.args.get("by", "").split(",") if dim]
+    if any(dim not in ROLLUP_DIMENSIONS for dim in by):
+        return jsonify({"error": f"by must be among {ROLLUP_DIMENSIONS}"}), 400
+
+    filters = {
+        dim: request.args.getlist(dim)
+        for dim in ROLLUP_DIMENSIONS
+        if request.args.getlist(dim)
+    }
+
+    try:
+        records = query_time_rollup(
+            rollup_path,
+            freq=request.args.get("freq", "D"),
+            by=by,
+            start=request.args.get("start"),
+            end=request.args.get("end"),
+            filters=filters,
+            histogram=histogram_path if os.path.exists(histogram_path) else None,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"series": records})
+
 @app.route("/analyze", methods=["POST"])
 def analyze():
 
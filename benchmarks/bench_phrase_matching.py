@@ -0,0 +1,70 @@
+"""
+Theme phrase matching throughput: one Aho–Corasick pass per review vs a
+substring scan per keyword phrase, then build_theme_rows end to end.
+
+    python -m benchmarks.bench_phrase_matching --reviews 1000000
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import load_flat_keywords, synthetic_reviews
+from scripts.phrase_matcher import match_phrase_ids
+from scripts.text_corpus import build_text_corpus
+from scripts.theme_extraction import build_keyword_index, build_theme_rows
+
+
+def substring_phrase_ids(phrases, text):
+    # the matching loop before the automaton
+    return {i for i, phrase in enumerate(phrases) if phrase in text}
+
+
+def rate(n, seconds):
+    return f"{n / seconds / 1000:8.1f}k reviews/s ({seconds:.2f} s)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reviews", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=1, help="build_theme_rows n_workers")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    keyword_index = build_keyword_index(load_flat_keywords())
+    automaton = keyword_index["phrase_automaton"]
+    phrases = [k["phrase"] for k in keyword_index["phrase_keywords"]]
+
+    reviews = synthetic_reviews(args.reviews, args.seed)
+    start = time.perf_counter()
+    corpus = build_text_corpus(reviews["review_text"])
+    corpus_s = time.perf_counter() - start
+    texts = corpus["normalized"]
+
+    avg_chars = sum(map(len, texts)) / len(texts)
+    print(
+        f"{len(texts):,} reviews, {avg_chars:.0f} chars on average, "
+        f"{len(phrases)} phrases, {len(automaton['delta'])} automaton states"
+    )
+
+    start = time.perf_counter()
+    scanned = [substring_phrase_ids(phrases, t) for t in texts]
+    scan_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matched = [match_phrase_ids(automaton, t) for t in texts]
+    automaton_s = time.perf_counter() - start
+
+    if scanned != matched:
+        raise SystemExit("✗ automaton and substring scan disagree")
+    print("✓ identical phrase hits")
+    print(f"substring scan: {rate(len(texts), scan_s)}")
+    print(f"automaton:      {rate(len(texts), automaton_s)}  ({scan_s / automaton_s:.1f}x)")
+
+    start = time.perf_counter()
+    themes_df = build_theme_rows(reviews, keyword_index, n_workers=args.workers, corpus=corpus)
+    rows_s = time.perf_counter() - start
+    print(f"text corpus:      {rate(len(texts), corpus_s)}")
+    print(f"build_theme_rows: {rate(len(texts), rows_s)}, {len(themes_df):,} theme rows")
+
+
+if __name__ == "__main__":
+    main()
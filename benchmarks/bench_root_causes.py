@@ -0,0 +1,87 @@
+"""
+Tier-3 root-cause aggregation at scale: summarize_root_causes vs the old
+iterrows / Counter loop over the negative food rows, then the whole
+run_full_multitier_analysis.
+
+Theme rows come from build_theme_rows over synthetic reviews and are
+tiled up to --theme-rows (review ids repeat, as identical reviews do).
+
+    python -m benchmarks.bench_root_causes --reviews 200000 --theme-rows 10000000
+"""
+import argparse
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from benchmarks.synthetic import load_flat_keywords, synthetic_reviews
+from scripts.multilayer_verbatim_analysis import run_full_multitier_analysis, summarize_root_causes
+from scripts.text_corpus import build_text_corpus
+from scripts.theme_extraction import build_keyword_index, build_theme_rows
+
+
+def summarize_root_causes_rowwise(food_neg, top_n=5):
+    # the aggregation before the columnar rewrite
+    total = len(food_neg)
+    root_cause_counter = Counter()
+    rating_impact = defaultdict(list)
+
+    for _, row in food_neg.iterrows():
+        key = f"{row['subtheme']}::{row['phrase']}"
+        root_cause_counter[key] += 1
+        rating_impact[key].append(row["rating"])
+
+    summary = []
+    for key, count in root_cause_counter.most_common(top_n):
+        subtheme, phrase = key.split("::")
+        summary.append({
+            "subtheme": subtheme,
+            "phrase": phrase,
+            "count": count,
+            "percentage_of_food_complaints": round((count / total) * 100, 2),
+            "avg_rating": round(sum(rating_impact[key]) / len(rating_impact[key]), 2)
+        })
+    return summary
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reviews", type=int, default=200_000)
+    parser.add_argument("--theme-rows", type=int, default=10_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-rowwise", action="store_true", help="skip the slow baseline")
+    args = parser.parse_args()
+
+    reviews = synthetic_reviews(args.reviews, args.seed)
+    corpus = build_text_corpus(reviews["review_text"])
+    themes = build_theme_rows(reviews, build_keyword_index(load_flat_keywords()), corpus=corpus)
+    themes = themes.iloc[np.resize(np.arange(len(themes)), args.theme_rows)].reset_index(drop=True)
+
+    food_neg = themes[
+        (themes["theme"] == "food") &
+        (themes["polarity"] == "negative") &
+        (themes["rating"] <= 2)
+    ]
+    print(f"{len(reviews):,} reviews, {len(themes):,} theme rows, {len(food_neg):,} negative food rows")
+
+    columnar, columnar_s = timed(summarize_root_causes, food_neg)
+    if not args.skip_rowwise:
+        rowwise, rowwise_s = timed(summarize_root_causes_rowwise, food_neg)
+        if rowwise != columnar:
+            raise SystemExit("✗ root-cause summaries differ")
+        print("✓ identical root-cause summary")
+        print(f"iterrows + Counter:    {rowwise_s:8.3f} s")
+    print(f"summarize_root_causes: {columnar_s:8.3f} s")
+
+    _, analysis_s = timed(run_full_multitier_analysis, reviews, themes, corpus=corpus, output_path=None)
+    print(f"run_full_multitier_analysis: {analysis_s:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Synthetic review text built from the repo's own vocabularies."""
+import json
+
+import numpy as np
+import pandas as pd
+
+from scripts.multilayer_verbatim_analysis import FOOD_ONTOLOGY_JSON
+from scripts.runnner import THEME_KEYWORDS_JSON
+
+FILLER_WORDS = [
+    "we", "ordered", "the", "was", "and", "it", "really", "for", "dinner",
+    "with", "my", "family", "again", "place", "today", "but", "quite",
+    "a", "bit", "our", "table", "came", "after", "time", "visit",
+]
+
+
+def load_flat_keywords():
+    with open(THEME_KEYWORDS_JSON, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def review_vocabulary():
+    """(keyword phrases, dish names) the synthetic text is drawn from."""
+    with open(FOOD_ONTOLOGY_JSON, "r", encoding="utf-8") as f:
+        ontology = json.load(f)
+    phrases = sorted({k["phrase"] for k in load_flat_keywords()})
+    dishes = [dish for group in ontology["food"]["dishes"].values() for dish in group]
+    return phrases, dishes
+
+
+def synthetic_reviews(n_reviews, seed=0, words_per_review=10, keyword_share=0.2, dish_share=0.05):
+    """
+    review_id / rating_overall / review_text frame. Each review mixes
+    filler words with keyword phrases and dish names, in mixed case and
+    with punctuation, so normalization and matching both do real work.
+    """
+    rng = np.random.default_rng(seed)
+    phrases, dishes = review_vocabulary()
+    pools = [np.array(FILLER_WORDS, dtype=object), np.array(phrases, dtype=object), np.array(dishes, dtype=object)]
+    weights = [1 - keyword_share - dish_share, keyword_share, dish_share]
+
+    lengths = rng.integers(words_per_review // 2, words_per_review * 3 // 2 + 1, n_reviews)
+    total = int(lengths.sum())
+    pool_of = rng.choice(len(pools), size=total, p=weights)
+    words = np.empty(total, dtype=object)
+    for i, pool in enumerate(pools):
+        at = np.flatnonzero(pool_of == i)
+        words[at] = pool[rng.integers(0, len(pool), len(at))]
+
+    ends = np.cumsum(lengths)
+    texts = [" ".join(words[end - n:end]) for end, n in zip(ends, lengths)]
+    shout = rng.random(n_reviews) < 0.1
+    texts = [t.upper() + "!!" if s else t.capitalize() + "." for t, s in zip(texts, shout)]
+
+    return pd.DataFrame({
+        "review_id": pd.util.hash_array(np.arange(n_reviews, dtype="int64")),
+        "rating_overall": rng.integers(1, 6, n_reviews).astype("float64"),
+        "review_text": texts,
+    })
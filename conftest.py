@@ -0,0 +1,2 @@
+# Keeps the repo root on sys.path so tests import `scripts` and
+# `benchmarks` the same way under plain `pytest` and `python -m pytest`.
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+# =========================
+# COLUMN-WISE ANOMALY ENGINE
+# =========================
+# Every rule is a function df -> boolean mask over all reviews; nothing
+# loops over rows. A review is anomalous when it raises two or more
+# flags, or any flag registered as standalone.
+#
+# New rules are added with register_anomaly_rule (or by passing a rules
+# list to detect_anomalies); they only have to return a mask.
+#
+# Rules see dataset-wide thresholds (anomaly_thresholds) through their
+# second argument rather than computing them from df, so a chunk of a
+# larger file can be checked against thresholds taken over the whole of
+# it.
+
+ANOMALY_RULES = []
+
+
+def register_anomaly_rule(name, mask, standalone=False):
+    """Add a rule; `mask(df, thresholds)` returns one boolean per review."""
+    ANOMALY_RULES.append({"name": name, "mask": mask, "standalone": standalone})
+    return mask
+
+
+def anomaly_thresholds(df):
+    """Dataset-wide thresholds the rules compare against."""
+    return {"like_99_percentile": df["like_count"].quantile(0.99)}
+
+
+def outlier_vs_restaurant(df, thresholds):
+    # only restaurants with enough reviews have a meaningful average
+    return (df["restaurant_review_count"] >= 20) & (
+        (df["rating_overall"] - df["restaurant_overall_rating"]).abs() > 3
+    )
+
+
+def viral_engagement(df, thresholds):
+    return (df["like_count"] > thresholds["like_99_percentile"]) & (df["like_count"] > 5)
+
+
+def low_rating_high_engagement(df, thresholds):
+    return (df["rating_overall"] <= 2) & (df["like_count"] > thresholds["like_99_percentile"])
+
+
+register_anomaly_rule("outlier_vs_restaurant", outlier_vs_restaurant)
+register_anomaly_rule("viral_engagement", viral_engagement, standalone=True)
+register_anomaly_rule("low_rating_high_engagement", low_rating_high_engagement, standalone=True)
+
+
+def anomaly_flag_matrix(df, rules=None, thresholds=None):
+    """
+    Boolean frame, one column per rule, row-aligned with df. thresholds
+    default to anomaly_thresholds(df).
+    """
+    rules = ANOMALY_RULES if rules is None else rules
+    thresholds = anomaly_thresholds(df) if thresholds is None else thresholds
+    # missing values (nullable like counts) never raise a flag
+    return pd.DataFrame(
+        {
+            rule["name"]: pd.Series(rule["mask"](df, thresholds), index=df.index).fillna(False).astype(bool)
+            for rule in rules
+        },
+        index=df.index,
+    )
+
+
+def detect_anomalies(df, rules=None, page=None, page_size=100, thresholds=None):
+    """
+    Counts and percentage of anomalous reviews, plus per-flag counts.
+    thresholds default to anomaly_thresholds(df); pass the whole
+    dataset's when df is one chunk of it.
+
+    With `page` set (0-based) the result also carries that page of
+    anomalous reviews, in input order, as a list of dicts; missing
+    ratings or like counts come back as None.
+    """
+    rules = ANOMALY_RULES if rules is None else rules
+    flags = anomaly_flag_matrix(df, rules, thresholds)
+
+    flag_values = flags.to_numpy()
+    flag_count = flag_values.sum(axis=1)
+    standalone = [rule["standalone"] for rule in rules]
+    is_anomaly = (flag_count >= 2) | flag_values[:, standalone].any(axis=1)
+
+    anomaly_rows = np.flatnonzero(is_anomaly)
+    result = {
+        "anomaly_count": len(anomaly_rows),
+        "anomaly_percentage": round(len(anomaly_rows) / len(df) * 100, 2),
+        "flag_counts": {
+            name: int(n) for name, n in zip(flags.columns, flag_values.sum(axis=0))
+        },
+    }
+
+    if page is not None:
+        rows = anomaly_rows[page * page_size:(page + 1) * page_size]
+        names = np.array(flags.columns, dtype=object)
+        page_df = df.iloc[rows]
+        result["page"] = page
+        result["page_size"] = page_size
+        result["total_pages"] = -(-len(anomaly_rows) // page_size)
+        result["anomalies"] = [
+            {
+                "reviewer_name": reviewer,
+                "rating_overall": None if pd.isna(rating) else float(rating),
+                "like_count": None if pd.isna(likes) else int(likes),
+                "restaurant_name": restaurant,
+                "anomaly_flags": "; ".join(names[row_flags]),
+                "flag_count": int(n_flags),
+            }
+            for reviewer, rating, likes, restaurant, row_flags, n_flags in zip(
+                page_df["reviewer_name"], page_df["rating_overall"],
+                page_df["like_count"], page_df["restaurant_name"],
+                flag_values[rows], flag_count[rows],
+            )
+        ]
+
+    return result
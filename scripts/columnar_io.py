@@ -0,0 +1,116 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+
+# =========================
+# TYPED INTERMEDIATE STORAGE
+# =========================
+# Intermediates between pipeline stages are written as Parquet or Feather
+# so dtypes (datetimes, categoricals, small ints) survive the round trip
+# and readers can load only the columns they need. CSV is still accepted
+# everywhere for user-facing exports.
+
+COLUMNAR_COMPRESSION = "zstd"
+
+
+def frame_format(path):
+    suffix = Path(path).suffix.lower()
+    if suffix in (".parquet", ".pq"):
+        return "parquet"
+    if suffix in (".feather", ".arrow"):
+        return "feather"
+    return "csv"
+
+
+def write_frame(df: pd.DataFrame, path):
+    fmt = frame_format(path)
+    if fmt == "parquet":
+        df.to_parquet(path, index=False, compression=COLUMNAR_COMPRESSION)
+    elif fmt == "feather":
+        df.reset_index(drop=True).to_feather(path, compression=COLUMNAR_COMPRESSION)
+    else:
+        df.to_csv(path, index=False)
+
+
+def read_frame(path, columns=None) -> pd.DataFrame:
+    fmt = frame_format(path)
+    if fmt == "parquet":
+        return pd.read_parquet(path, columns=columns)
+    if fmt == "feather":
+        return pd.read_feather(path, columns=columns)
+    return pd.read_csv(path, usecols=columns)
+
+
+def iter_frame_chunks(path, chunksize, columns=None):
+    """Yield the file as DataFrames of at most `chunksize` rows."""
+    fmt = frame_format(path)
+    if fmt == "parquet":
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    elif fmt == "feather":
+        with pa.memory_map(str(path)) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns is not None:
+                    batch = batch.select(columns)
+                for start in range(0, batch.num_rows, chunksize):
+                    yield batch.slice(start, chunksize).to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunksize)
+
+
+def as_frame(source, columns=None) -> pd.DataFrame:
+    """
+    Stage input that is either an in-memory DataFrame or a path to one.
+    Frames come back as a new object over the same data, so a stage can
+    add or replace columns without touching the caller's frame.
+    """
+    if isinstance(source, pd.DataFrame):
+        return source[columns] if columns is not None else source.copy(deep=False)
+    return read_frame(source, columns=columns)
+
+
+def write_frames(frames, path) -> int:
+    """
+    Write an iterable of DataFrame chunks to one file without holding
+    them all in memory. The first chunk fixes the columnar schema.
+    Returns the number of rows written.
+    """
+    fmt = frame_format(path)
+    total_rows = 0
+    writer = None
+    schema = None
+
+    try:
+        for i, chunk in enumerate(frames):
+            if fmt == "csv":
+                chunk.to_csv(path, index=False, mode="w" if i == 0 else "a", header=(i == 0))
+            else:
+                table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                if writer is None:
+                    # categories differ per chunk, so give dictionaries room to grow
+                    schema = pa.schema(
+                        [
+                            f.with_type(pa.dictionary(pa.int32(), f.type.value_type))
+                            if pa.types.is_dictionary(f.type) else f
+                            for f in table.schema
+                        ],
+                        metadata=table.schema.metadata,
+                    )
+                    table = table.cast(schema)
+                    if fmt == "parquet":
+                        writer = pq.ParquetWriter(path, schema, compression=COLUMNAR_COMPRESSION)
+                    else:
+                        writer = pa.ipc.new_file(
+                            path, schema,
+                            options=pa.ipc.IpcWriteOptions(compression=COLUMNAR_COMPRESSION)
+                        )
+                writer.write_table(table)
+            total_rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return total_rows
@@ -1,23 +1,47 @@
 import pandas as pd
+import numpy as np
 import os
 import sys
+import warnings
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+
+from .columnar_io import write_frame, write_frames
 # STEP 1: INPUT INGESTION
 
+# Compressed single-file uploads are decompressed on the fly by pandas;
+# nothing is written to disk.
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+
+
+def describe_input_file(file_path):
+    """Return (format, compression), e.g. ("csv", "gzip") for reviews.csv.gz."""
+    suffixes = [s.lower() for s in Path(file_path).suffixes]
+    compression = None
+    if suffixes and suffixes[-1] in COMPRESSION_SUFFIXES:
+        compression = COMPRESSION_SUFFIXES[suffixes.pop()]
+    file_ext = suffixes[-1].lstrip('.') if suffixes else ""
+    return file_ext, compression
+
+
 def read_input_file(file_path):
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File does not exist: {file_path}")
 
     file_path = Path(file_path)
-    file_ext = file_path.suffix.lower().lstrip('.')
+    file_ext, compression = describe_input_file(file_path)
 
     if file_ext == "csv":
-        df = pd.read_csv(file_path, encoding="utf-8", engine="python")
+        df = pd.read_csv(file_path, encoding="utf-8", engine="python", compression=compression)
+    elif file_ext == "zip":
+        df = pd.concat(iter_zip_mapped_members(file_path), ignore_index=True)
     elif file_ext in ["xlsx", "xls"]:
         all_sheets = pd.read_excel(file_path, sheet_name=None)
         df = pd.concat(all_sheets.values(), ignore_index=True)
     else:
-        raise ValueError("Unsupported file format. Use CSV or Excel.")
+        raise ValueError("Unsupported file format. Use CSV, Excel or a zip of CSVs.")
 
     return df
 
@@ -208,38 +232,277 @@ DEFAULT_VALUES = {
     "primary_cuisine": "unknown",
 }
 
+# kept when the input provides them (e.g. archive member per row)
+OPTIONAL_COLUMNS = ["source_file"]
+
 def enforce_schema(df):
     for col in REQUIRED_COLUMNS:
         if col not in df.columns:
             df[col] = DEFAULT_VALUES[col]
-    return df[REQUIRED_COLUMNS]
+    return df[REQUIRED_COLUMNS + [c for c in OPTIONAL_COLUMNS if c in df.columns]]
 
 # STEP 4.5: ROW CLEANING
 
+# Canned text for reviews with no usable text. Ratings are truncated
+# toward zero before lookup (4.7 -> 4); anything outside 1..5 falls
+# back to "average".
+RATING_TEXT_MAP = {
+    5: "very good",
+    4: "good",
+    3: "average",
+    2: "bad",
+    1: "very bad"
+}
+DEFAULT_RATING_TEXT = "average"
+
+
 def clean_rows_based_on_rating(df):
     df["rating_overall"] = pd.to_numeric(df["rating_overall"], errors="coerce")
     df = df[df["rating_overall"].notna()]
 
-    def auto_review(row):
-        if isinstance(row["review_text"], str) and row["review_text"].strip():
-            return row["review_text"]
+    text = df["review_text"]
+    # non-string cells come back as NaN from the .str accessor
+    if pd.api.types.infer_dtype(text, skipna=True) in ("string", "mixed", "mixed-integer", "empty"):
+        has_text = text.str.contains(r"\S", regex=True, na=False)
+    else:
+        has_text = pd.Series(False, index=df.index)
 
-        rating_map = {
-            5: "very good",
-            4: "good",
-            3: "average",
-            2: "bad",
-            1: "very bad"
-        }
-        return rating_map.get(int(row["rating_overall"]), "average")
+    fill_text = (
+        np.trunc(df["rating_overall"].where(np.isfinite(df["rating_overall"])))
+        .map(RATING_TEXT_MAP)
+        .fillna(DEFAULT_RATING_TEXT)
+    )
 
-    df["review_text"] = df.apply(auto_review, axis=1)
+    df["review_text"] = text.where(has_text, fill_text)
     return df
 
+# STEP 4.8: STABLE REVIEW IDS
+
+# Content hash over the fields that identify a review. like_count is left
+# out on purpose: likes keep changing after a review is posted.
+REVIEW_ID_COLUMNS = [
+    "created_at",
+    "reviewer_name",
+    "review_text",
+    "rating_overall",
+    "restaurant_name",
+    "city",
+    "primary_cuisine",
+]
+
+
+def new_review_id_state():
+    """Occurrence counts per content hash, carried across the chunks of one file."""
+    return {
+        "hashes": np.empty(0, dtype="uint64"),
+        "counts": np.empty(0, dtype="int64"),
+    }
+
+
+def compute_review_ids(df, state=None):
+    """
+    uint64 ID per row, independent of row position and of the dtypes
+    chosen by the dtype plan. Expects created_at already parsed (NaT
+    allowed) so the ID does not depend on the export's date format.
+
+    The ID is a content hash plus the row's occurrence number among
+    identical rows of the same file: the first copy keeps the plain
+    content hash, later copies hash (content hash, occurrence). Duplicate
+    rows thus stay distinct reviews, while re-ingesting a file yields the
+    same IDs again. Chunked callers pass one new_review_id_state() for
+    all chunks of a file so occurrences keep counting across chunks.
+    """
+    created = pd.to_datetime(df["created_at"], errors="coerce", utc=True)
+    key = pd.DataFrame({
+        "created_at": ((created - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1))
+        .fillna(-1)
+        .astype("int64"),
+        "rating_overall": df["rating_overall"].astype("float64"),
+    })
+    for col in REVIEW_ID_COLUMNS:
+        if col not in key.columns:
+            key[col] = df[col].astype(str)
+
+    content = pd.util.hash_pandas_object(key[REVIEW_ID_COLUMNS], index=False).to_numpy()
+
+    codes, uniques = pd.factorize(content)
+    occurrence = pd.Series(codes).groupby(codes).cumcount().to_numpy()
+
+    if state is not None:
+        hashes, counts = state["hashes"], state["counts"]
+        pos = np.searchsorted(hashes, uniques)
+        found = pos < len(hashes)
+        found[found] = hashes[pos[found]] == uniques[found]
+
+        previous = np.zeros(len(uniques), dtype="int64")
+        previous[found] = counts[pos[found]]
+        occurrence = occurrence + previous[codes]
+
+        chunk_counts = np.bincount(codes, minlength=len(uniques))
+        counts[pos[found]] += chunk_counts[found]
+        order = np.argsort(uniques[~found], kind="stable")
+        new_hashes = uniques[~found][order]
+        at = np.searchsorted(hashes, new_hashes)
+        state["hashes"] = np.insert(hashes, at, new_hashes)
+        state["counts"] = np.insert(counts, at, chunk_counts[~found][order])
+
+    review_ids = content.copy()
+    repeat = occurrence > 0
+    if repeat.any():
+        review_ids[repeat] = pd.util.hash_pandas_object(
+            pd.DataFrame({"content": content[repeat], "occurrence": occurrence[repeat]}),
+            index=False,
+        ).to_numpy()
+    return review_ids
+
 # STEP 5: TIME FEATURES
 
+DATETIME_SAMPLE_SIZE = 2000
+DATETIME_CANDIDATES_PER_SHAPE = 5
+DATETIME_FORMAT_CACHE_SIZE = 256
+
+
+def datetime_value_shapes(values):
+    # "2023-06-12 03:47" -> "9999-99-99 99:99", "Jun 12" -> "aaa 99"
+    return (
+        values.str.replace(r"\d", "9", regex=True)
+        .str.replace(r"[^\W\d_]", "a", regex=True)
+    )
+
+
+def datetime_format_coverage(sample, formats):
+    """Share of `sample` values parsed by at least one of `formats`."""
+    if not len(sample):
+        return 0.0
+    parsed = pd.Series(False, index=sample.index)
+    for fmt in formats:
+        parsed |= pd.to_datetime(sample, format=fmt, errors="coerce", utc=True).notna()
+    return float(parsed.mean())
+
+
+def infer_datetime_formats(series, sample_size=DATETIME_SAMPLE_SIZE, cache=None):
+    """
+    Infer the formats used in a string date column from an evenly spaced
+    sample. Each value shape gets the candidate format (month-first or
+    day-first guess) that parses most of its sampled values. Formats are
+    ordered by sampled-row coverage.
+
+    `cache` is a dict owned by one ingestion (the chunks of one file), keyed
+    by column fingerprint, so later chunks with the same layout skip
+    inference. A cached entry is only reused while it still parses the
+    current sample as well as it did the one it was inferred from.
+    Without a cache every call infers from its own sample.
+    """
+    values = series.dropna()
+    if values.empty:
+        return []
+
+    positions = np.unique(np.linspace(0, len(values) - 1, min(sample_size, len(values))).astype(int))
+    sample = values.iloc[positions].astype(str)
+    shapes = datetime_value_shapes(sample)
+
+    fingerprint = (series.name, frozenset(shapes.unique()))
+    if cache is not None and fingerprint in cache:
+        formats, coverage_ratio = cache[fingerprint]
+        if datetime_format_coverage(sample, formats) >= coverage_ratio:
+            return formats
+
+    from pandas.tseries.api import guess_datetime_format
+
+    coverage = {}
+    for shape, group in sample.groupby(shapes, sort=False):
+        candidates = []
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for value in group.unique()[:DATETIME_CANDIDATES_PER_SHAPE]:
+                for dayfirst in (False, True):
+                    fmt = guess_datetime_format(value, dayfirst=dayfirst)
+                    if fmt and fmt not in candidates:
+                        candidates.append(fmt)
+
+        best_fmt, best_hits = None, 0
+        for fmt in candidates:
+            hits = int(pd.to_datetime(group, format=fmt, errors="coerce", utc=True).notna().sum())
+            if hits > best_hits:
+                best_fmt, best_hits = fmt, hits
+
+        if best_fmt:
+            coverage[best_fmt] = coverage.get(best_fmt, 0) + best_hits
+
+    formats = sorted(coverage, key=coverage.get, reverse=True)
+
+    if cache is not None:
+        if len(cache) >= DATETIME_FORMAT_CACHE_SIZE:
+            cache.clear()
+        cache[fingerprint] = (formats, datetime_format_coverage(sample, formats))
+    return formats
+
+
+def parse_datetime_column(series, format_cache=None):
+    """
+    Parse a date column to UTC with one vectorized pass per inferred
+    format. Values no format matches get a per-element fallback.
+    Returns the parsed series and a report of how each row was handled.
+    `format_cache` is passed on to infer_datetime_formats.
+    """
+    report = {
+        "formats": {},
+        "fallback_parsed": 0,
+        "unparsed": 0,
+        "missing": int(series.isna().sum()),
+    }
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return pd.to_datetime(series, utc=True), report
+
+    if pd.api.types.infer_dtype(series, skipna=True) not in ("string", "empty"):
+        # Excel cells, numbers or mixed objects: let pandas sort it out
+        parsed = pd.to_datetime(series, errors="coerce", utc=True, format="mixed")
+        report["unparsed"] = int(parsed.isna().sum()) - report["missing"]
+        return parsed, report
+
+    values = series.to_numpy(dtype=object)
+    result = np.full(len(values), np.datetime64("NaT"), dtype="datetime64[ns]")
+    remaining = series.notna().to_numpy().copy()
+
+    for fmt in infer_datetime_formats(series, cache=format_cache):
+        if not remaining.any():
+            break
+        idx = np.flatnonzero(remaining)
+        parsed = pd.to_datetime(values[idx], format=fmt, errors="coerce", utc=True)
+        ok = parsed.notna()
+        result[idx[ok]] = parsed[ok].tz_convert(None).as_unit("ns").to_numpy()
+        remaining[idx[ok]] = False
+        report["formats"][fmt] = int(ok.sum())
+
+    if remaining.any():
+        idx = np.flatnonzero(remaining)
+        parsed = pd.to_datetime(values[idx], errors="coerce", utc=True, format="mixed")
+        ok = parsed.notna()
+        result[idx[ok]] = parsed[ok].tz_convert(None).as_unit("ns").to_numpy()
+        report["fallback_parsed"] = int(ok.sum())
+        report["unparsed"] = int((~ok).sum())
+
+    parsed = pd.Series(
+        pd.DatetimeIndex(result).tz_localize("UTC"),
+        index=series.index,
+        name=series.name,
+    )
+    return parsed, report
+
+
+def merge_parse_reports(total, report):
+    """Add a parse_datetime_column report into `total` (in place)."""
+    formats = total.setdefault("formats", {})
+    for fmt, n in report["formats"].items():
+        formats[fmt] = formats.get(fmt, 0) + n
+    for key in ("fallback_parsed", "unparsed", "missing"):
+        total[key] = total.get(key, 0) + report[key]
+    return total
+
+
 def add_and_fix_time_features(df):
-    df["created_at"] = pd.to_datetime(df["created_at"], errors="coerce", utc=True)
+    df["created_at"], _ = parse_datetime_column(df["created_at"])
 
     if df["created_at"].isna().any():
         fallback = df["created_at"].dropna().min()
@@ -259,11 +522,105 @@ def add_and_fix_time_features(df):
 
     return df
 
+# STEP 5.5: DTYPE PLAN
+
+# Low-cardinality strings become categoricals; numeric columns get the
+# smallest type that holds them. like_count uses a nullable int so a
+# missing value does not force the whole column to float.
+CATEGORY_CANDIDATES = ["city", "restaurant_name", "primary_cuisine", "reviewer_name", "year_month", "source_file"]
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+SMALL_INT_COLUMNS = {"day_of_week": "int8", "hour_of_day": "int8"}
+
+# narrowest -> widest; used to merge per-chunk plans
+NUMERIC_DTYPE_ORDER = ["int8", "Int32", "Int64", "float64"]
+
+
+def numeric_dtype_plan(df):
+    plan = {}
+
+    rating = df["rating_overall"]
+    if rating.notna().all() and (rating % 1 == 0).all() and rating.between(-128, 127).all():
+        plan["rating_overall"] = "int8"
+    else:
+        plan["rating_overall"] = "float64"
+
+    likes = pd.to_numeric(df["like_count"], errors="coerce").dropna()
+    if not (likes % 1 == 0).all():
+        plan["like_count"] = "float64"
+    elif len(likes) == 0 or likes.abs().max() < 2**31:
+        plan["like_count"] = "Int32"
+    else:
+        plan["like_count"] = "Int64"
+
+    return plan
+
+
+def widen_dtype_plan(plan, other):
+    if plan is None:
+        return dict(other)
+    return {
+        col: max(plan[col], other[col], key=NUMERIC_DTYPE_ORDER.index)
+        for col in plan
+    }
+
+
+def apply_dtype_plan(df, numeric_plan=None, category_columns=None):
+    if numeric_plan is None:
+        numeric_plan = numeric_dtype_plan(df)
+
+    if category_columns is None:
+        category_columns = [
+            col for col in CATEGORY_CANDIDATES
+            if col in df.columns
+            and df[col].nunique() <= CATEGORY_MAX_UNIQUE_RATIO * max(len(df), 1)
+        ]
+
+    for col in category_columns:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+    for col, dtype in SMALL_INT_COLUMNS.items():
+        if col in df.columns:
+            df[col] = df[col].astype(dtype)
+
+    df["rating_overall"] = df["rating_overall"].astype(numeric_plan["rating_overall"])
+    df["like_count"] = pd.to_numeric(df["like_count"], errors="coerce").astype(numeric_plan["like_count"])
+
+    return df
+
+
+def memory_usage_report(before_bytes, before_dtypes, after):
+    """
+    Per-column dtypes and deep memory use before / after the dtype plan.
+    `before_bytes` and `before_dtypes` are df.memory_usage(deep=True,
+    index=False) and df.dtypes recorded before apply_dtype_plan, so the
+    frame itself never has to be copied.
+    """
+    after_bytes = after.memory_usage(deep=True, index=False)
+
+    columns = {}
+    for col in after.columns:
+        columns[col] = {
+            "dtype_before": str(before_dtypes[col]) if col in before_dtypes.index else None,
+            "dtype_after": str(after[col].dtype),
+            "bytes_before": int(before_bytes.get(col, 0)),
+            "bytes_after": int(after_bytes[col]),
+        }
+
+    total_before = int(before_bytes.sum())
+    total_after = int(after_bytes.sum())
+    return {
+        "columns": columns,
+        "total_bytes_before": total_before,
+        "total_bytes_after": total_after,
+        "reduction_factor": round(total_before / total_after, 2) if total_after else None,
+    }
+
 # STEP 6: AGGREGATION
 
 def add_restaurant_aggregates(df):
     agg = (
-        df.groupby("restaurant_name")
+        df.groupby("restaurant_name", observed=True)
         .agg(
             restaurant_review_count=("rating_overall", "count"),
             restaurant_overall_rating=("rating_overall", "mean")
@@ -271,6 +628,7 @@ def add_restaurant_aggregates(df):
         .reset_index()
     )
 
+    agg["restaurant_review_count"] = agg["restaurant_review_count"].astype("int32")
     agg["restaurant_overall_rating"] = agg["restaurant_overall_rating"].round(2)
     return df.merge(agg, on="restaurant_name", how="left")
 
@@ -284,28 +642,305 @@ def prepare_for_export(df):
 
 # CORE PIPELINE FUNCTION
 
-def standardize_restaurant_reviews(input_file_path, output_file_path=None):
-    raw_df = read_input_file(input_file_path)
-
-    df = apply_header_if_needed(raw_df, detect_header_row(raw_df))
+def map_columns(df):
+    df = apply_header_if_needed(df, detect_header_row(df))
     df = normalize_column_names(df)
 
     df = semantic_column_mapping(df, STANDARD_COLUMN_SYNONYMS)
-    df = resolve_duplicate_columns(df)
+    return resolve_duplicate_columns(df)
+
+
+def standardize_restaurant_reviews(input_file_path, output_file_path=None):
+    if describe_input_file(input_file_path)[0] == "zip":
+        # each member has its own layout and is mapped on its own
+        df = resolve_duplicate_columns(read_input_file(input_file_path))
+    else:
+        df = map_columns(read_input_file(input_file_path))
 
     df = enforce_schema(df)
     df = clean_rows_based_on_rating(df)
 
+    df["created_at"], date_report = parse_datetime_column(df["created_at"])
+    df.insert(0, "review_id", compute_review_ids(df))
     df = add_and_fix_time_features(df)
+
+    before_bytes = df.memory_usage(deep=True, index=False)
+    before_dtypes = df.dtypes
+    df = apply_dtype_plan(df)
+    memory_report = memory_usage_report(before_bytes, before_dtypes, df)
+
     df = add_restaurant_aggregates(df)
 
     df = prepare_for_export(df)
+    df.attrs["memory_report"] = memory_report
+    df.attrs["created_at_parse_report"] = date_report
 
     if output_file_path:
-        df.to_csv(output_file_path, index=False)
+        write_frame(df, output_file_path)
 
     return df
 
+# STREAMING PIPELINE (CHUNKED MODE)
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# per-chunk cardinality is not representative, so streaming output uses a
+# fixed set of categoricals (reviewer names are often near-unique)
+STREAMING_CATEGORY_COLUMNS = ["city", "restaurant_name", "primary_cuisine", "year_month", "source_file"]
+
+
+def detect_column_layout(file_path, scan_rows=10, compression=None):
+    """
+    Run header detection and column mapping once on the head of the file.
+    Returns the number of lines to skip before the data and the mapped
+    column labels to apply to every chunk.
+    """
+    probe = pd.read_csv(file_path, encoding="utf-8", nrows=scan_rows, compression=compression)
+    header_index = detect_header_row(probe, scan_rows)
+
+    df = apply_header_if_needed(probe, header_index)
+    df = normalize_column_names(df)
+    df = semantic_column_mapping(df, STANDARD_COLUMN_SYNONYMS)
+
+    skip_lines = 1 if header_index == 0 else header_index + 2
+    return skip_lines, list(df.columns)
+
+
+def iter_csv_mapped_chunks(file_path, chunksize=DEFAULT_CHUNKSIZE, compression=None):
+    skip_lines, columns = detect_column_layout(file_path, compression=compression)
+
+    reader = pd.read_csv(
+        file_path,
+        encoding="utf-8",
+        engine="c",
+        header=None,
+        skiprows=skip_lines,
+        dtype=str,
+        chunksize=chunksize,
+        compression=compression,
+    )
+    for chunk in reader:
+        chunk.columns = columns
+        yield chunk
+
+
+def iter_parallel_mapped(worker, file_path, parts, max_workers=None):
+    """
+    Run worker(file_path, part) in a process pool and yield the results
+    in the order of `parts`. At most max_workers parts are in flight, so
+    the whole input is never held in memory at once.
+    """
+    if not parts:
+        return
+    max_workers = max_workers or min(len(parts), os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        names = iter(parts)
+        pending = deque(
+            pool.submit(worker, file_path, name)
+            for _, name in zip(range(max_workers), names)
+        )
+        while pending:
+            df = pending.popleft().result()
+            name = next(names, None)
+            if name is not None:
+                pending.append(pool.submit(worker, file_path, name))
+            if df is not None:
+                yield df
+
+
+def list_zip_csv_members(file_path):
+    with zipfile.ZipFile(file_path) as zf:
+        return [
+            info.filename for info in zf.infolist()
+            if not info.is_dir()
+            and info.filename.lower().endswith(".csv")
+            and not info.filename.startswith("__MACOSX/")
+        ]
+
+
+def read_zip_member_mapped(file_path, member):
+    """
+    Worker: stream one CSV out of the archive (no temporary copy), map
+    its columns and tag every row with the member name.
+    """
+    with zipfile.ZipFile(file_path) as zf, zf.open(member) as fh:
+        df = pd.read_csv(fh, encoding="utf-8")
+
+    if df.empty:
+        return None
+
+    df = map_columns(df)
+    df["source_file"] = member
+    return df
+
+
+def iter_zip_mapped_members(file_path, max_workers=None):
+    return iter_parallel_mapped(
+        read_zip_member_mapped, file_path, list_zip_csv_members(file_path), max_workers
+    )
+
+
+def list_excel_sheets(file_path):
+    if Path(file_path).suffix.lower() == ".xls":
+        return pd.ExcelFile(file_path).sheet_names
+
+    from openpyxl import load_workbook
+    wb = load_workbook(file_path, read_only=True)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def read_excel_sheet_mapped(file_path, sheet_name):
+    """
+    Worker: stream one sheet with openpyxl's read-only reader, then run
+    header detection and column mapping for that sheet alone.
+    """
+    if Path(file_path).suffix.lower() == ".xls":
+        df = pd.read_excel(file_path, sheet_name=sheet_name)
+    else:
+        from openpyxl import load_workbook
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = wb[sheet_name].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return None
+            df = pd.DataFrame(rows, columns=header)
+        finally:
+            wb.close()
+
+    df = df.dropna(how="all")
+    if df.empty:
+        return None
+
+    return map_columns(df)
+
+
+def iter_excel_mapped_sheets(file_path, max_workers=None):
+    return iter_parallel_mapped(
+        read_excel_sheet_mapped, file_path, list_excel_sheets(file_path), max_workers
+    )
+
+
+def iter_frame_slices(frames, chunksize):
+    """Split each frame of `frames` into pieces of at most `chunksize` rows."""
+    for df in frames:
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+
+
+def iter_standardized_chunks(file_path, chunksize=DEFAULT_CHUNKSIZE, max_workers=None, parse_report=None):
+    """
+    Cleaned, date-parsed chunks with review IDs. The created_at parse
+    reports of all chunks are summed into `parse_report` when a dict is
+    given.
+    """
+    file_ext, compression = describe_input_file(file_path)
+    if file_ext == "csv":
+        chunks = iter_csv_mapped_chunks(file_path, chunksize, compression)
+    elif file_ext == "zip":
+        chunks = iter_frame_slices(iter_zip_mapped_members(file_path, max_workers), chunksize)
+    elif file_ext in ["xlsx", "xls"]:
+        chunks = iter_frame_slices(iter_excel_mapped_sheets(file_path, max_workers), chunksize)
+    else:
+        raise ValueError("Unsupported file format. Use CSV, Excel or a zip of CSVs.")
+
+    # (column name, frozenset of value shapes) -> (formats, sample coverage),
+    # shared by the chunks of this file only
+    format_cache = {}
+    id_state = new_review_id_state()
+    for chunk in chunks:
+        chunk = resolve_duplicate_columns(chunk)
+        chunk = enforce_schema(chunk)
+        chunk = clean_rows_based_on_rating(chunk)
+        chunk["created_at"], report = parse_datetime_column(chunk["created_at"], format_cache)
+        if parse_report is not None:
+            merge_parse_reports(parse_report, report)
+        chunk.insert(0, "review_id", compute_review_ids(chunk, id_state))
+        yield chunk
+
+
+def restaurant_aggregates_from_sums(sums):
+    agg = pd.DataFrame({
+        "restaurant_name": sums.index,
+        "restaurant_review_count": sums["count"].astype("int32").values,
+        "restaurant_overall_rating": (sums["sum"] / sums["count"]).round(2).values,
+    })
+    return agg
+
+
+def finalize_standardized_chunk(chunk, fallback, agg, numeric_plan):
+    chunk["created_at"] = chunk["created_at"].fillna(fallback)
+
+    chunk = add_and_fix_time_features(chunk)
+    chunk = chunk.merge(agg, on="restaurant_name", how="left")
+    chunk = apply_dtype_plan(chunk, numeric_plan, STREAMING_CATEGORY_COLUMNS)
+    return prepare_for_export(chunk)
+
+
+def standardize_restaurant_reviews_chunked(
+    input_file_path,
+    output_file_path,
+    chunksize=DEFAULT_CHUNKSIZE,
+    max_workers=None,
+    parse_report=None
+):
+    """
+    Streaming variant of standardize_restaurant_reviews for large CSVs
+    (plain, .gz or .zst), multi-sheet workbooks and zip archives of CSVs.
+
+    CSVs are read in chunks of `chunksize` rows. Excel sheets and archive
+    members are parsed in parallel (up to `max_workers` processes), each
+    with its own header detection and column mapping, and are then
+    processed in slices of `chunksize` rows.
+
+    Pass 1 cleans each chunk and keeps only the running per-restaurant
+    count/sum, the earliest timestamp and the dtype plan. Pass 2 streams
+    the source again, fills missing timestamps, adds time features and
+    restaurant aggregates, and appends to the output. Nothing but the
+    output is written to disk.
+
+    Memory: for CSVs the working set is bounded by the chunk size. A
+    workbook sheet or archive member is read whole by its worker, so up
+    to max_workers of them are held at once.
+
+    Returns the number of rows written. The created_at parse report
+    (summed over chunks, same fields as the in-memory path's
+    attrs["created_at_parse_report"]) goes into `parse_report` if given.
+    """
+    sums = None
+    fallback = pd.NaT
+    numeric_plan = None
+
+    # PASS 1: clean + running sums
+    for chunk in iter_standardized_chunks(input_file_path, chunksize, max_workers, parse_report):
+        part = chunk.groupby("restaurant_name")["rating_overall"].agg(["count", "sum"])
+        sums = part if sums is None else sums.add(part, fill_value=0)
+        numeric_plan = widen_dtype_plan(numeric_plan, numeric_dtype_plan(chunk))
+
+        chunk_min = chunk["created_at"].min()
+        if pd.notna(chunk_min) and (pd.isna(fallback) or chunk_min < fallback):
+            fallback = chunk_min
+
+    if pd.isna(fallback):
+        fallback = pd.Timestamp("1970-01-01", tz="UTC")
+
+    if sums is None:
+        sums = pd.DataFrame(columns=["count", "sum"])
+    agg = restaurant_aggregates_from_sums(sums)
+    if numeric_plan is None:
+        numeric_plan = {"rating_overall": "float64", "like_count": "Int32"}
+
+    # PASS 2: re-stream the source, time features + aggregates
+    chunks = iter_standardized_chunks(input_file_path, chunksize, max_workers)
+    return write_frames(
+        (finalize_standardized_chunk(chunk, fallback, agg, numeric_plan) for chunk in chunks),
+        output_file_path,
+    )
+
 # CLI ENTRY POINT
 
 
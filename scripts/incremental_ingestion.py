@@ -0,0 +1,127 @@
+import pandas as pd
+from pathlib import Path
+
+from .columnar_io import read_frame, write_frame
+from .excel_ingestion import (
+    standardize_restaurant_reviews,
+    apply_dtype_plan,
+    restaurant_aggregates_from_sums,
+)
+
+# =========================
+# INCREMENTAL STATE LAYOUT
+# =========================
+# state_dir/
+#   reviews/part-00000.parquet   standardized reviews, one part per run
+#   themes/part-00000.parquet    theme rows for those reviews
+#   restaurant_sums.parquet      running count / rating sum per restaurant
+#
+# Parts are only ever appended, so a daily run writes the delta, not the
+# corpus. Reviews are keyed by the content-hash review_id from ingestion.
+
+AGGREGATE_COLUMNS = ["restaurant_review_count", "restaurant_overall_rating"]
+
+
+def _part_paths(directory):
+    return sorted(Path(directory).glob("part-*.parquet"))
+
+
+def _append_part(directory, df):
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"part-{len(_part_paths(directory)):05d}.parquet"
+    write_frame(df, path)
+    return path
+
+
+def _read_parts(directory, columns=None):
+    parts = [read_frame(p, columns=columns) for p in _part_paths(directory)]
+    if not parts:
+        return None
+    # categories differ between parts; concat falls back to plain strings
+    return pd.concat(parts, ignore_index=True)
+
+
+def load_seen_review_ids(state_dir):
+    ids = _read_parts(Path(state_dir) / "reviews", columns=["review_id"])
+    if ids is None:
+        return pd.Index([], dtype="uint64")
+    return pd.Index(ids["review_id"])
+
+
+def load_restaurant_sums(state_dir):
+    path = Path(state_dir) / "restaurant_sums.parquet"
+    if not path.exists():
+        return pd.DataFrame(columns=["count", "sum"], dtype="float64")
+    return read_frame(path).set_index("restaurant_name")
+
+
+def save_restaurant_sums(state_dir, sums):
+    write_frame(
+        sums.rename_axis("restaurant_name").reset_index(),
+        Path(state_dir) / "restaurant_sums.parquet"
+    )
+
+
+def load_review_store(state_dir):
+    """
+    Full corpus from the store with restaurant aggregates attached from the
+    running sums, in the same shape standardize_restaurant_reviews returns.
+    """
+    reviews = _read_parts(Path(state_dir) / "reviews")
+    if reviews is None:
+        raise ValueError(f"No reviews ingested yet in {state_dir}")
+
+    agg = restaurant_aggregates_from_sums(load_restaurant_sums(state_dir))
+    reviews["restaurant_name"] = reviews["restaurant_name"].astype(str)
+    agg["restaurant_name"] = agg["restaurant_name"].astype(str)
+
+    reviews = reviews.merge(agg, on="restaurant_name", how="left")
+    return apply_dtype_plan(reviews)
+
+
+def ingest_incremental(input_file_path, state_dir):
+    """
+    Standardize an upload, drop reviews already in the store, append the
+    rest and fold them into the per-restaurant running sums.
+    Returns the new reviews only.
+
+    Identical rows within one upload are kept, as in the full pipeline, so
+    a first upload into an empty store gives the same corpus as a full
+    run; only reviews from earlier uploads are skipped.
+    """
+    state_dir = Path(state_dir)
+
+    df = standardize_restaurant_reviews(input_file_path)
+    df = df.drop(columns=AGGREGATE_COLUMNS)
+
+    seen = load_seen_review_ids(state_dir)
+    new_reviews = df[~df["review_id"].isin(seen)].reset_index(drop=True)
+
+    if len(new_reviews):
+        part = (
+            new_reviews.assign(restaurant_name=new_reviews["restaurant_name"].astype(str))
+            .groupby("restaurant_name")["rating_overall"]
+            .agg(["count", "sum"])
+            .astype("float64")
+        )
+        sums = load_restaurant_sums(state_dir).add(part, fill_value=0)
+
+        _append_part(state_dir / "reviews", new_reviews)
+        save_restaurant_sums(state_dir, sums)
+
+    return new_reviews
+
+
+def append_theme_rows(state_dir, new_themes_df):
+    if len(new_themes_df):
+        _append_part(Path(state_dir) / "themes", new_themes_df)
+
+
+def load_theme_store(state_dir):
+    themes = _read_parts(Path(state_dir) / "themes")
+    if themes is None:
+        return pd.DataFrame(
+            columns=["review_id", "rating", "theme", "subtheme", "polarity", "phrase"]
+        )
+    return themes
@@ -1,19 +1,26 @@
 import json
+import numpy as np
 import pandas as pd
 from collections import defaultdict, Counter
 from pathlib import Path
 
+from .columnar_io import as_frame
+from .vocab_cache import load_compiled_vocabulary
+from .text_corpus import build_text_corpus
+from .phrase_matcher import build_phrase_automaton, match_phrase_ids
+
 BASE_DIR = Path(__file__).resolve().parent
 # =========================================================
 # CONFIG
 # =========================================================
-REVIEWS_CSV = BASE_DIR / "standardized_output.csv"
-THEMES_CSV = BASE_DIR / "themes_test.csv"
+REVIEWS_PATH = BASE_DIR / "standardized_output.parquet"
+THEMES_PATH = BASE_DIR / "themes_test.parquet"
 RULE_KEYWORDS_JSON = BASE_DIR / "rule_keywords.json"
 FOOD_ONTOLOGY_JSON = BASE_DIR / "food_domain_ontology.json"
 REVIEW_TEXT_COLUMN = "review_text"
+OUTPUT_JSON = "multitier_analysis_output.json"
 # =========================================================
-# TIER-2 CONFIG (must match themes_test.csv)
+# TIER-2 CONFIG (must match themes_test.parquet)
 # =========================================================
 TIER2_FOOD_SUBTHEMES = {
     "texture",
@@ -24,72 +31,183 @@ TIER2_FOOD_SUBTHEMES = {
     "portion_size"
 }
 
+# =========================================================
+# COMPILED VOCABULARIES (cached by vocab_cache)
+# =========================================================
+def build_rule_index(rule_keywords: dict):
+    """
+    All domains' keywords in one automaton. Pattern i is the i-th
+    (domain, keyword) entry in file order, so a keyword listed under two
+    domains counts for both.
+    """
+    domains = list(rule_keywords)
+    keywords, keyword_domain = [], []
+    for d, domain in enumerate(domains):
+        for kw in rule_keywords[domain]:
+            keywords.append(kw)
+            keyword_domain.append(d)
+
+    return {
+        "domains": domains,
+        "keywords": keywords,
+        "keyword_domain": np.asarray(keyword_domain, dtype=np.int64),
+        "automaton": build_phrase_automaton(keywords),
+    }
+
+
+def build_dish_index(food_ontology: dict):
+    """Every dish of every ontology group, in file order, in one automaton."""
+    all_dishes = []
+    for group in food_ontology["food"]["dishes"].values():
+        all_dishes.extend(group)
+
+    return {
+        "dishes": all_dishes,
+        "automaton": build_phrase_automaton(all_dishes),
+    }
+
 # =========================================================
 # RULE-BASED CLASSIFIER (TIER-1)
 # =========================================================
-def rule_based_classify(text: str, rule_map: dict):
-    text = text.lower()
-    domain_hits = defaultdict(int)
-    matched_anchor = None
-
-    for domain, keywords in rule_map.items():
-        for kw in keywords:
-            if kw in text:
-                domain_hits[domain] += 1
-                if matched_anchor is None:
-                    matched_anchor = kw
-
-    if not domain_hits:
-        return None
+def classify_rule_domains(lowered_texts, rule_index):
+    """
+    Tier-1 for a batch of lowercased texts in one scan each: per text the
+    domain with the most distinct keyword hits (ties go to the domain
+    listed first in rule_keywords.json), confidence = hits / 3 capped at
+    1, and the anchor — the leftmost, then longest, keyword of that domain
+    in the text. Texts without hits get top_domain None.
+    """
+    automaton = rule_index["automaton"]
+    keyword_domain = rule_index["keyword_domain"]
+    n_domains = len(rule_index["domains"])
+
+    hit_ids = [match_phrase_ids(automaton, text) for text in lowered_texts]
+    owners = np.repeat(
+        np.arange(len(hit_ids)),
+        np.fromiter(map(len, hit_ids), dtype=np.int64, count=len(hit_ids))
+    )
+    flat_ids = np.fromiter((i for ids in hit_ids for i in ids), dtype=np.int64, count=len(owners))
+
+    domain_hits = np.bincount(
+        owners * n_domains + keyword_domain[flat_ids], minlength=len(hit_ids) * n_domains
+    ).reshape(len(hit_ids), n_domains)
+    top = domain_hits.argmax(axis=1)  # first maximum -> file order on ties
+    top_hits = domain_hits[np.arange(len(hit_ids)), top]
+
+    keywords = rule_index["keywords"]
+    anchors = [
+        min(
+            (keywords[i] for i in ids if keyword_domain[i] == d),
+            key=lambda kw: (text.find(kw), -len(kw))
+        ) if n else None
+        for text, ids, d, n in zip(lowered_texts, hit_ids, top, top_hits)
+    ]
 
-    top_domain = max(domain_hits, key=domain_hits.get)
-    confidence = min(1.0, domain_hits[top_domain] / 3)
+    domains = np.asarray(rule_index["domains"], dtype=object)
+    # object columns keep None for texts without hits
+    return pd.DataFrame({
+        "top_domain": pd.Series(np.where(top_hits > 0, domains[top], None), dtype=object),
+        "confidence": np.minimum(1.0, top_hits / 3).round(2),
+        "matched_anchor": pd.Series(anchors, dtype=object),
+    })
+
+
+def rule_based_classify(text: str, rule_index: dict):
+    result = classify_rule_domains([text.lower()], rule_index).iloc[0]
+    if result["top_domain"] is None:
+        return None
 
     return {
-        "top_domain": top_domain,
-        "confidence": round(confidence, 2),
-        "matched_anchor": matched_anchor
+        "top_domain": result["top_domain"],
+        "confidence": float(result["confidence"]),
+        "matched_anchor": result["matched_anchor"]
     }
 
+# =========================================================
+# ROOT CAUSE AGGREGATION (TIER-3)
+# =========================================================
+def summarize_root_causes(food_neg: pd.DataFrame, top_n: int = 5):
+    """
+    Mentions and mean rating per (subtheme, phrase) in one columnar pass.
+    Groups keep first-appearance order and the stable sort keeps it among
+    equal counts, the same tie order Counter.most_common gave.
+    """
+    total = len(food_neg)
+    phrase_stats = (
+        food_neg
+        .groupby(["subtheme", "phrase"], sort=False, observed=True)["rating"]
+        .agg(["size", "mean"])
+        .sort_values("size", ascending=False, kind="stable")
+        .head(top_n)
+    )
+
+    return [
+        {
+            "subtheme": subtheme,
+            "phrase": phrase,
+            "count": int(count),
+            "percentage_of_food_complaints": round((int(count) / total) * 100, 2),
+            "avg_rating": round(float(mean_rating), 2)
+        }
+        for (subtheme, phrase), count, mean_rating in zip(
+            phrase_stats.index, phrase_stats["size"], phrase_stats["mean"]
+        )
+    ]
+
 # =========================================================
 # MAIN MULTI-TIER ANALYSIS FUNCTION
 # =========================================================
-def run_full_multitier_analysis():
+def run_full_multitier_analysis(
+    reviews=REVIEWS_PATH, themes=THEMES_PATH, corpus=None, output_path=OUTPUT_JSON
+):
+    """
+    reviews / themes are DataFrames or paths to them. The result is also
+    written to output_path as JSON unless it is None.
+    """
     # -----------------------------
     # LOAD FILES
     # -----------------------------
-    df_reviews = pd.read_csv(REVIEWS_CSV)
-    df_themes = pd.read_csv(THEMES_CSV)
+    df_reviews = as_frame(reviews, columns=["review_id", REVIEW_TEXT_COLUMN])
+    df_themes = as_frame(themes)
 
-    df_reviews.rename(columns={"rating": "rating_overall"}, inplace=True)
-    
-    with open(RULE_KEYWORDS_JSON, "r", encoding="utf-8") as f:
-        RULE_KEYWORDS = json.load(f)
+    df_reviews = df_reviews.rename(columns={"rating": "rating_overall"})
+
+    # shared lowercased text, row-aligned with df_reviews
+    if corpus is None:
+        corpus = build_text_corpus(df_reviews[REVIEW_TEXT_COLUMN])
+    if len(corpus["lowered"]) != len(df_reviews):
+        raise ValueError("Text corpus does not match the reviews")
 
-    with open(FOOD_ONTOLOGY_JSON, "r", encoding="utf-8") as f:
-        FOOD_ONTOLOGY = json.load(f)
+    RULE_INDEX = load_compiled_vocabulary(RULE_KEYWORDS_JSON, build_rule_index)
+    DISH_INDEX = load_compiled_vocabulary(FOOD_ONTOLOGY_JSON, build_dish_index)
 
     # =====================================================
     # 🟦 TIER 1: VERBATIM DOMAIN DISTRIBUTION
     # =====================================================
-    tier1_results = []
-
-    for idx, text in enumerate(df_reviews[REVIEW_TEXT_COLUMN].astype(str)):
-        result = rule_based_classify(text, RULE_KEYWORDS)
-        if result:
-            tier1_results.append({
-                "review_id": idx,
-                "domain": result["top_domain"]
-            })
+    # texts equal after lowercasing are folded with factorize, so each is
+    # classified once, in one batch
+    codes, unique_texts = pd.factorize(corpus["lowered"])
+    unique_domains = classify_rule_domains(unique_texts, RULE_INDEX)["top_domain"].to_numpy(dtype=object)
+    domains = unique_domains[codes]
+    has_domain = pd.notna(domains)
+
+    if len(codes):
+        print(
+            f"✓ Tier-1 classification: {len(unique_texts):,} distinct texts for "
+            f"{len(codes):,} reviews ({1 - len(unique_texts) / len(codes):.1%} reused)"
+        )
 
     # 🔥 SAFETY CHECK
-    if not tier1_results:
+    if not has_domain.any():
         raise ValueError(
             "Tier-1 produced zero results. "
             "Check rule_keywords.json, review text column, or keyword coverage."
         )
 
-    tier1_df = pd.DataFrame(tier1_results)
+    tier1_df = pd.DataFrame({
+        "review_id": df_reviews["review_id"].to_numpy()[has_domain],
+        "domain": domains[has_domain]
+    })
 
     tier1_counts = Counter(tier1_df["domain"])
     tier1_total = len(tier1_df)
@@ -206,22 +324,6 @@ def run_full_multitier_analysis():
     for concept, phrases in PHRASE_CANONICAL_MAP.items():
         for p in phrases:
             PHRASE_TO_CONCEPT[p] = concept
-    from collections import defaultdict
-
-    def canonicalize_failure_breakdown(phrase_counts: dict):
-        concept_counts = defaultdict(int)
-
-        for phrase, count in phrase_counts.items():
-            phrase_l = phrase.lower()
-
-            if phrase_l in PHRASE_TO_CONCEPT:
-                concept = PHRASE_TO_CONCEPT[phrase_l]
-                concept_counts[concept] += count
-            else:
-                # keep uncategorized phrases as-is (optional)
-                concept_counts["other"] += count
-
-        return dict(concept_counts)
 
     food_neg = df_themes[
         (df_themes["theme"] == "food") &
@@ -231,68 +333,76 @@ def run_full_multitier_analysis():
     
     TOTAL_NEG_FOOD = len(food_neg)
 
-    root_cause_counter = Counter()
-    rating_impact = defaultdict(list)
-
-    for _, row in food_neg.iterrows():
-        key = f"{row['subtheme']}::{row['phrase']}"
-        root_cause_counter[key] += 1
-        rating_impact[key].append(row["rating"])
-
-    TOP_ROOT_CAUSES = root_cause_counter.most_common(5)
     # =====================================================
     # 🟥 ROOT CAUSE SUMMARY (TOP 5 PHRASES)
     # =====================================================
-    root_cause_summary = []
-
-    for key, count in TOP_ROOT_CAUSES:
-        subtheme, phrase = key.split("::")
-        percentage = round((count / TOTAL_NEG_FOOD) * 100, 2)
-        avg_rating = round(
-            sum(rating_impact[key]) / len(rating_impact[key]), 2
-        )
-
-        root_cause_summary.append({
-            "subtheme": subtheme,
-            "phrase": phrase,
-            "count": count,
-            "percentage_of_food_complaints": percentage,
-            "avg_rating": avg_rating
-        })
-
-    ALL_DISHES = []
-    for group in FOOD_ONTOLOGY["food"]["dishes"].values():
-        ALL_DISHES.extend(group)
+    root_cause_summary = summarize_root_causes(food_neg, top_n=5)
 
     # =====================================================
     # 🟥 TIER 3: DISH-LEVEL ROOT CAUSE ANALYSIS (FIXED)
     # =====================================================
-    dish_root_map = defaultdict(lambda: defaultdict(int))
+    # ingestion IDs are unique per row; frames from elsewhere may repeat
+    # one, and then any copy's text will do
+    lowered_text_by_id = (
+        pd.Series(corpus["lowered"], index=df_reviews["review_id"])
+        .pipe(lambda s: s[~s.index.duplicated()])
+    )
 
-    # 1️⃣ Populate raw phrase-level failures
-    for _, row in food_neg.iterrows():
-        review_text = df_reviews.loc[row["review_id"], REVIEW_TEXT_COLUMN].lower()
-        for dish in ALL_DISHES:
-            if dish in review_text:
-                dish_root_map[dish][row["phrase"].lower()] += 1
+    # 1️⃣ Review -> dishes index: one automaton scan per distinct text
+    neg_review_ids = food_neg["review_id"].unique()
+    codes, unique_texts = pd.factorize(lowered_text_by_id.loc[neg_review_ids].to_numpy())
+    dishes_per_text = [sorted(match_phrase_ids(DISH_INDEX["automaton"], t)) for t in unique_texts]
 
-    # 2️⃣ Canonicalize + score dishes
-    dish_failure_scores = []
+    review_dishes = pd.DataFrame(
+        [
+            (review_id, dish_entry)
+            for review_id, code in zip(neg_review_ids, codes)
+            for dish_entry in dishes_per_text[code]
+        ],
+        columns=["review_id", "dish_entry"]
+    ).astype({"review_id": food_neg["review_id"].dtype, "dish_entry": "int64"})
+
+    # 2️⃣ Join phrase-level failures to dishes; sorting by theme row, then
+    #    ontology order keeps the first-appearance order of the old scan
+    failures = (
+        food_neg[["review_id", "phrase"]]
+        .assign(row=np.arange(len(food_neg)))
+        .merge(review_dishes, on="review_id")
+        .sort_values(["row", "dish_entry"], kind="stable")
+    )
+    pair_counts = (
+        failures
+        .assign(
+            dish=np.asarray(DISH_INDEX["dishes"], dtype=object)[failures["dish_entry"].to_numpy()],
+            phrase=failures["phrase"].str.lower()
+        )
+        .groupby(["dish", "phrase"], sort=False)
+        .size()
+    )
 
-    for dish, phrase_counts in dish_root_map.items():
-        total_failures = sum(phrase_counts.values())
-        if total_failures < 3:
-            continue
+    # 3️⃣ Canonicalize + score dishes over the (dish, phrase) counts;
+    #    uncategorized phrases are kept under "other"
+    dish_pairs = pair_counts.rename("count").reset_index()
+    dish_pairs["concept"] = dish_pairs["phrase"].map(PHRASE_TO_CONCEPT).fillna("other")
 
-        canonical_breakdown = canonicalize_failure_breakdown(phrase_counts)
+    dish_totals = dish_pairs.groupby("dish", sort=False)["count"].sum()
+    concept_counts = dish_pairs.groupby(["dish", "concept"], sort=False)["count"].sum()
 
-        dish_failure_scores.append({
+    canonical_breakdowns = defaultdict(dict)
+    for (dish, concept), count in concept_counts.items():
+        canonical_breakdowns[dish][concept] = int(count)
+
+    dish_failure_scores = [
+        {
             "dish": dish,
-            "total_negative_mentions": total_failures,
-            "failure_breakdown": canonical_breakdown
-        })
+            "total_negative_mentions": int(total_failures),
+            "failure_breakdown": canonical_breakdowns[dish]
+        }
+        for dish, total_failures in dish_totals.items()
+        if total_failures >= 3
+    ]
 
-    # 3️⃣ Sort & pick top 10 ONLY
+    # 4️⃣ Sort & pick top 10 ONLY
     top_10_dish_failures = sorted(
         dish_failure_scores,
         key=lambda x: x["total_negative_mentions"],
@@ -312,9 +422,11 @@ def run_full_multitier_analysis():
         "tier_2": tier2_output,
         "tier_3": tier3_output
     }
-    with open("multitier_analysis_output.json", "w", encoding="utf-8") as f:
-        json.dump(final_output, f, indent=2)
-    print("Done with Verbatim Multilayer Analysis. Output saved to multitier_analysis_output.json")
+    print("Done with Verbatim Multilayer Analysis.")
+    if output_path is not None:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(final_output, f, indent=2)
+        print(f"Output saved to {output_path}")
     return final_output
 
 
@@ -0,0 +1,108 @@
+# =========================
+# MULTI-PATTERN PHRASE MATCHER (AHO–CORASICK)
+# =========================
+# All phrases are compiled once into a single automaton; matching walks
+# each text one character at a time, so the cost depends on the text
+# length and not on the number of phrases.
+#
+# The automaton is stored as plain lists/dicts so it pickles cheaply for
+# worker processes and on-disk caches.
+
+
+def build_phrase_automaton(phrases):
+    """
+    Compile `phrases` into a deterministic automaton.
+
+    Pattern ids are positions in `phrases`; duplicate phrases keep their
+    own ids. Returns {"delta", "outputs", "lengths"}:
+      delta[state]   -> {char: next_state}; missing chars go to the root
+      outputs[state] -> pattern ids ending at this state (incl. suffixes)
+      lengths[id]    -> phrase length, for boundary checks
+    """
+    goto = [{}]
+    own_outputs = [[]]
+
+    for pattern_id, phrase in enumerate(phrases):
+        state = 0
+        for ch in phrase:
+            nxt = goto[state].get(ch)
+            if nxt is None:
+                nxt = len(goto)
+                goto[state][ch] = nxt
+                goto.append({})
+                own_outputs.append([])
+            state = nxt
+        own_outputs[state].append(pattern_id)
+
+    # breadth-first: failure links, then fold them into full transitions
+    fail = [0] * len(goto)
+    delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+    outputs = [tuple(own_outputs[0])] + [None] * (len(goto) - 1)
+
+    queue = list(goto[0].values())
+    head = 0
+    while head < len(queue):
+        state = queue[head]
+        head += 1
+
+        fallback = delta[fail[state]]
+        transitions = dict(fallback)
+        for ch, nxt in goto[state].items():
+            transitions[ch] = nxt
+            fail[nxt] = fallback.get(ch, 0)
+            queue.append(nxt)
+        delta[state] = transitions
+        outputs[state] = tuple(own_outputs[state]) + outputs[fail[state]]
+
+    return {
+        "delta": delta,
+        "outputs": outputs,
+        "lengths": [len(p) for p in phrases],
+    }
+
+
+def iter_phrase_matches(automaton, text):
+    """Yield (pattern_id, end) for every occurrence, end exclusive."""
+    delta = automaton["delta"]
+    outputs = automaton["outputs"]
+    state = 0
+    for i, ch in enumerate(text):
+        state = delta[state].get(ch, 0)
+        if outputs[state]:
+            for pattern_id in outputs[state]:
+                yield pattern_id, i + 1
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+def match_phrase_ids(automaton, text, word_boundary=False):
+    """
+    Set of pattern ids occurring in `text` — the same set as
+    `{i for i, p in enumerate(phrases) if p in text}`.
+
+    With word_boundary=True a hit only counts when it is not glued to
+    letters/digits on either side ("cold" will not match "scolded").
+    """
+    if word_boundary:
+        lengths = automaton["lengths"]
+        hits = set()
+        for pattern_id, end in iter_phrase_matches(automaton, text):
+            start = end - lengths[pattern_id]
+            if start > 0 and _is_word_char(text[start - 1]):
+                continue
+            if end < len(text) and _is_word_char(text[end]):
+                continue
+            hits.add(pattern_id)
+        return hits
+
+    delta = automaton["delta"]
+    outputs = automaton["outputs"]
+    hits = set()
+    state = 0
+    for ch in text:
+        state = delta[state].get(ch, 0)
+        if outputs[state]:
+            hits.update(outputs[state])
+    return hits
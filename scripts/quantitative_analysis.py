@@ -1,8 +1,37 @@
 import pandas as pd
 import numpy as np
+import os
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from scipy import stats
-from scipy.stats import f_oneway, ttest_ind, pearsonr
+from functools import partial
+from scipy.stats import ttest_ind, ttest_ind_from_stats, pearsonr
+from .columnar_io import as_frame, write_frame
+from .anomaly_engine import detect_anomalies
+from .time_rollup import (
+    RATING_HISTOGRAM_FILE,
+    ROLLUP_FILE,
+    build_rating_histogram,
+    build_time_rollup,
+    merge_time_rollups,
+    rollup_series,
+)
+from .excel_ingestion import DEFAULT_CHUNKSIZE
+from .streaming_stats import (
+    comoments_from_values,
+    comoments_pearson,
+    histogram_medians,
+    merge_comoments,
+    merge_moments,
+    merge_summaries,
+    moments_from_values,
+    moments_std,
+    quantitative_summary_report,
+    sketch_quantiles,
+    stream_reduce,
+    summarize_chunk,
+)
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -37,7 +66,7 @@ def detect_outliers_iqr(series, column_name, multiplier=1.5):
 
 def detect_outliers_zscore(series, column_name, threshold=3):
     """Detect outliers using Z-score method."""
-    z_scores = np.abs(stats.zscore(series.dropna()))
+    z_scores = np.abs(stats.zscore(series.dropna().to_numpy(dtype=float)))
     outliers_mask = z_scores > threshold
     outliers = series[series.index.isin(series.dropna().index[outliers_mask])]
     
@@ -51,12 +80,6 @@ def detect_outliers_zscore(series, column_name, threshold=3):
 #        'outlier_indices': list(outliers.index.tolist())
     }
 
-def eta_squared_from_groups(groups):
-    all_vals = np.concatenate(groups)
-    grand_mean = all_vals.mean()
-    ss_between = sum(len(g) * (g.mean() - grand_mean) ** 2 for g in groups)
-    ss_total = ((all_vals - grand_mean) ** 2).sum()
-    return ss_between / ss_total if ss_total != 0 else 0.0
 
 def interpret_eta_sq(eta):
     if eta < 0.01:
@@ -100,32 +123,105 @@ def interpret_r(r):
     else:
         return "Very strong"
 
+# ============ GROUP STATISTICS CACHE ============
+# Rating sufficient statistics per city / cuisine / restaurant, computed
+# once per run. Descriptive tables, ANOVA and the cuisine summary are all
+# derived from these instead of regrouping the frame in every stage.
+
+GROUP_STATS_KEYS = ["city", "primary_cuisine", "restaurant_name"]
+
+def build_group_stats(df, keys=GROUP_STATS_KEYS, value="rating_overall"):
+    """
+    {key: frame indexed by group} with count, sum, sum_sq, min, max and
+    median of `value` (missing values skipped, empty groups dropped).
+    """
+    values = df[value].astype("float64")
+    group_stats = {}
+    for key in keys:
+        frame = pd.DataFrame({
+            key: df[key], "value": df[value], "value_f": values, "value_sq": values * values
+        })
+        group_stats[key] = frame.groupby(key, observed=True).agg(
+            count=("value", "count"),
+            sum=("value_f", "sum"),
+            sum_sq=("value_sq", "sum"),
+            min=("value", "min"),
+            max=("value", "max"),
+            median=("value", "median"),
+        )
+    return group_stats
+
+def _group_variance(table):
+    """Sample variance per group from the sums (NaN below 2 values)."""
+    n = table["count"].astype("float64")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (table["sum_sq"] - table["sum"] ** 2 / n) / (n - 1)
+    return var.clip(lower=0).where(n > 1)
+
+def describe_group_stats(table):
+    """count / mean / std / median / min / max per group, plus cv_%."""
+    described = pd.DataFrame({
+        "count": table["count"],
+        "mean": table["sum"] / table["count"],
+        "std": np.sqrt(_group_variance(table)),
+        "median": table["median"],
+        "min": table["min"],
+        "max": table["max"],
+    })
+    described["cv_%"] = np.where(
+        described["mean"] != 0, described["std"] / described["mean"] * 100, 0
+    )
+    return described
+
+def anova_from_group_stats(table, min_group_size=3):
+    """
+    One-way ANOVA F, p and eta² over the groups with at least
+    min_group_size values, from counts, sums and sums of squares.
+    Returns None with fewer than two such groups.
+    """
+    table = table[table["count"] >= min_group_size]
+    k = len(table)
+    if k < 2:
+        return None
+
+    n = table["count"].to_numpy(dtype="float64")
+    sums = table["sum"].to_numpy(dtype="float64")
+    sum_sq = table["sum_sq"].to_numpy(dtype="float64")
+    n_total = n.sum()
+    grand_mean = sums.sum() / n_total
+
+    ss_between = float((n * (sums / n - grand_mean) ** 2).sum())
+    ss_within = float(max((sum_sq - sums ** 2 / n).sum(), 0.0))
+    ss_total = ss_between + ss_within
+
+    df_between, df_within = k - 1, n_total - k
+    with np.errstate(invalid="ignore", divide="ignore"):
+        f_stat = np.float64(ss_between / df_between) / np.float64(ss_within / df_within)
+    p_value = stats.f.sf(f_stat, df_between, df_within)
+
+    return {
+        "F_statistic": float(f_stat),
+        "p_value": float(p_value),
+        "eta_squared": ss_between / ss_total if ss_total != 0 else 0.0,
+        "n_groups": k,
+    }
+
 # ============ STAGE 1: DESCRIPTIVE STATISTICS ============
 
-def stage_1_descriptive_stats(df):
-    """Compute descriptive statistics."""
-    print("\n" + "="*80)
-    print("STAGE 1: DESCRIPTIVE STATISTICS")
-    print("="*80)
-    
-    n_cities = df["city"].nunique()
-    n_restaurants = df["restaurant_name"].nunique()
-    
-    do_city_stats = n_cities > 1
-    do_restaurant_stats = n_restaurants > 1
-    
+def dataset_scope(n_cities, n_restaurants):
     if n_cities == 1 and n_restaurants == 1:
-        scope = "SINGLE_RESTAURANT_SINGLE_CITY"
+        return "SINGLE_RESTAURANT_SINGLE_CITY"
     elif n_cities == 1 and n_restaurants > 1:
-        scope = "MULTIPLE_RESTAURANTS_SINGLE_CITY"
+        return "MULTIPLE_RESTAURANTS_SINGLE_CITY"
     else:
-        scope = "MULTIPLE_CITIES"
-    
-    result = {}
-    
-    # KEY INSIGHTS
-    insights = {
-        'Dataset Scope': scope,
+        return "MULTIPLE_CITIES"
+
+def review_key_insights(df):
+    """Headline numbers of stage 1 from the review frame."""
+    n_cities = df["city"].nunique()
+    n_restaurants = df["restaurant_name"].nunique()
+    return {
+        'Dataset Scope': dataset_scope(n_cities, n_restaurants),
         'Total Reviews': int(len(df)),
         'Date Range': f"{df['created_at'].min().date()} to {df['created_at'].max().date()}",
         'Number of Cities': int(n_cities),
@@ -141,30 +237,41 @@ def stage_1_descriptive_stats(df):
         'CV Likes (%)': round(coefficient_of_variation(df['like_count']), 2),
         'Reviews with Likes': f"{(df['like_count'] > 0).sum()} ({(df['like_count'] > 0).sum() / len(df) * 100:.1f}%)",
     }
-    result['key_insights'] = insights
+
+def stage_1_descriptive_stats(df, group_stats=None, overall_stats=None, key_insights=None):
+    """
+    Compute descriptive statistics. group_stats, overall_stats and
+    key_insights may come precomputed; with all three df may be None.
+    """
+    print("\n" + "="*80)
+    print("STAGE 1: DESCRIPTIVE STATISTICS")
+    print("="*80)
+    if group_stats is None:
+        group_stats = build_group_stats(df)
+    
+    result = {}
+    
+    # KEY INSIGHTS
+    if key_insights is None:
+        key_insights = review_key_insights(df)
+    result['key_insights'] = key_insights
     print("\n✓ Key Insights computed")
     
+    do_city_stats = key_insights['Number of Cities'] > 1
+    do_restaurant_stats = key_insights['Number of Restaurants'] > 1
+    
     # OVERALL STATS
-    numeric_cols = ['rating_overall', 'like_count', 'restaurant_overall_rating', 'restaurant_review_count']
-    overall_stats = df[numeric_cols].describe().to_dict()
-    cv_values = {col: coefficient_of_variation(df[col]) for col in numeric_cols}
-    overall_stats['cv_%'] = cv_values
+    if overall_stats is None:
+        numeric_cols = ['rating_overall', 'like_count', 'restaurant_overall_rating', 'restaurant_review_count']
+        overall_stats = df[numeric_cols].describe().to_dict()
+        cv_values = {col: coefficient_of_variation(df[col]) for col in numeric_cols}
+        overall_stats['cv_%'] = cv_values
     result['overall_stats'] = overall_stats
     print("✓ Overall statistics computed")
     
     # BY CITY
     if do_city_stats:
-        by_city_dict = {}
-        by_city = df.groupby('city')['rating_overall'].agg(
-            count='count',
-            mean='mean',
-            std='std',
-            median='median',
-            min='min',
-            max='max'
-        ).to_dict('index')
-        for city, stats_dict in by_city.items():
-            stats_dict['cv_%'] = (stats_dict['std'] / stats_dict['mean'] * 100) if stats_dict['mean'] != 0 else 0
+        by_city = describe_group_stats(group_stats['city']).to_dict('index')
         result['by_city'] = by_city
         print("✓ By-City statistics computed")
     else:
@@ -172,33 +279,16 @@ def stage_1_descriptive_stats(df):
         print("✓ By-City statistics: skipped (only 1 city)")
     
     # BY CUISINE
-    by_cuisine_dict = {}
-    by_cuisine = df.groupby('primary_cuisine')['rating_overall'].agg(
-        count='count',
-        mean='mean',
-        std='std',
-        median='median',
-        min='min',
-        max='max'
-    ).to_dict('index')
-    for cuisine, stats_dict in by_cuisine.items():
-        stats_dict['cv_%'] = (stats_dict['std'] / stats_dict['mean'] * 100) if stats_dict['mean'] != 0 else 0
+    by_cuisine = describe_group_stats(group_stats['primary_cuisine']).to_dict('index')
     result['by_cuisine'] = by_cuisine
     print("✓ By-Cuisine statistics computed")
     
     # BY RESTAURANT (top 20)
     if do_restaurant_stats:
-        by_restaurant_dict = {}
-        by_restaurant = df.groupby('restaurant_name')['rating_overall'].agg(
-            count='count',
-            mean='mean',
-            std='std',
-            median='median',
-            min='min',
-            max='max'
-        ).sort_values('count', ascending=False).head(20).to_dict('index')
-        for rest, stats_dict in by_restaurant.items():
-            stats_dict['cv_%'] = (stats_dict['std'] / stats_dict['mean'] * 100) if stats_dict['mean'] != 0 else 0
+        by_restaurant = (
+            describe_group_stats(group_stats['restaurant_name'])
+            .sort_values('count', ascending=False).head(20).to_dict('index')
+        )
         result['by_restaurant_top20'] = by_restaurant
         print("✓ By-Restaurant statistics (top 20) computed")
     else:
@@ -209,34 +299,33 @@ def stage_1_descriptive_stats(df):
 
 # ============ STAGE 2: ANOVA & STATISTICAL TESTS ============
 
-def stage_2_statistical_tests(df):
-    """Run ANOVA and statistical tests."""
+def stage_2_statistical_tests(df, group_stats=None, rating_likes=None):
+    """
+    Run ANOVA and statistical tests. With group_stats and rating_likes
+    (see summarize_review_chunk) precomputed, df may be None.
+    """
     print("\n" + "="*80)
     print("STAGE 2: STATISTICAL TESTS (ANOVA, T-TEST, CORRELATION)")
     print("="*80)
+    if group_stats is None:
+        group_stats = build_group_stats(df, keys=["city", "primary_cuisine"])
     
     result = {}
-    n_cities = df["city"].nunique()
-    n_cuisines = df["primary_cuisine"].nunique()
+    n_cities = len(group_stats["city"])
+    n_cuisines = len(group_stats["primary_cuisine"])
     
     # ANOVA BY CITY
     if n_cities > 1:
-        groups = []
-        for city, g in df.groupby("city"):
-            vals = g["rating_overall"].dropna().values
-            if len(vals) >= 3:
-                groups.append(vals)
+        anova = anova_from_group_stats(group_stats['city'])
         
-        if len(groups) >= 2:
-            f_city, p_city = f_oneway(*groups)
-            eta_city = eta_squared_from_groups(groups)
+        if anova is not None:
             result['anova_by_city'] = {
-                'F_statistic': float(f_city),
-                'p_value': float(p_city),
-                'eta_squared': float(eta_city),
-                'effect_size': interpret_eta_sq(eta_city),
-                'n_groups': len(groups),
-                'significant': signif_code(p_city)
+                'F_statistic': anova['F_statistic'],
+                'p_value': anova['p_value'],
+                'eta_squared': anova['eta_squared'],
+                'effect_size': interpret_eta_sq(anova['eta_squared']),
+                'n_groups': anova['n_groups'],
+                'significant': signif_code(anova['p_value'])
             }
             print("✓ ANOVA by City computed")
         else:
@@ -248,22 +337,16 @@ def stage_2_statistical_tests(df):
     
     # ANOVA BY CUISINE
     if n_cuisines > 1:
-        groups = []
-        for cuis, g in df.groupby("primary_cuisine"):
-            vals = g["rating_overall"].dropna().values
-            if len(vals) >= 3:
-                groups.append(vals)
+        anova = anova_from_group_stats(group_stats['primary_cuisine'])
         
-        if len(groups) >= 2:
-            f_c, p_c = f_oneway(*groups)
-            eta_c = eta_squared_from_groups(groups)
+        if anova is not None:
             result['anova_by_cuisine'] = {
-                'F_statistic': float(f_c),
-                'p_value': float(p_c),
-                'eta_squared': float(eta_c),
-                'effect_size': interpret_eta_sq(eta_c),
-                'n_groups': len(groups),
-                'significant': signif_code(p_c)
+                'F_statistic': anova['F_statistic'],
+                'p_value': anova['p_value'],
+                'eta_squared': anova['eta_squared'],
+                'effect_size': interpret_eta_sq(anova['eta_squared']),
+                'n_groups': anova['n_groups'],
+                'significant': signif_code(anova['p_value'])
             }
             print("✓ ANOVA by Cuisine computed")
         else:
@@ -274,15 +357,25 @@ def stage_2_statistical_tests(df):
         print("✓ ANOVA by Cuisine: skipped (only 1 cuisine)")
     
     # T-TEST: LIKES vs NO LIKES
-    high = df[df["like_count"] > 0]["rating_overall"].dropna().values
-    low = df[df["like_count"] == 0]["rating_overall"].dropna().values
-    
-    if len(high) >= 5 and len(low) >= 5:
-        t_stat, p_t = ttest_ind(high, low, equal_var=False)
-        s1, s2 = high.std(ddof=1), low.std(ddof=1)
+    if rating_likes is None:
+        high = df[df["like_count"] > 0]["rating_overall"].dropna().to_numpy(dtype=float)
+        low = df[df["like_count"] == 0]["rating_overall"].dropna().to_numpy(dtype=float)
         n1, n2 = len(high), len(low)
+        if n1 >= 5 and n2 >= 5:
+            t_stat, p_t = ttest_ind(high, low, equal_var=False)
+            s1, s2 = high.std(ddof=1), low.std(ddof=1)
+            mean1, mean2 = high.mean(), low.mean()
+    else:
+        high, low = rating_likes["with_likes"], rating_likes["without_likes"]
+        n1, n2 = high["count"], low["count"]
+        if n1 >= 5 and n2 >= 5:
+            s1, s2 = moments_std(high), moments_std(low)
+            mean1, mean2 = high["mean"], low["mean"]
+            t_stat, p_t = ttest_ind_from_stats(mean1, s1, n1, mean2, s2, n2, equal_var=False)
+    
+    if n1 >= 5 and n2 >= 5:
         pooled = np.sqrt(((n1 - 1)*s1**2 + (n2 - 1)*s2**2) / (n1 + n2 - 2)) if (n1+n2-2) > 0 else 0
-        d = (high.mean() - low.mean()) / pooled if pooled != 0 else 0.0
+        d = (mean1 - mean2) / pooled if pooled != 0 else 0.0
         
         result['ttest_likes_comparison'] = {
             't_statistic': float(t_stat),
@@ -290,9 +383,9 @@ def stage_2_statistical_tests(df):
             'cohens_d': float(d),
             'effect_size': interpret_cohens_d(d),
             'significant': signif_code(p_t),
-            'mean_with_likes': float(high.mean()),
-            'mean_without_likes': float(low.mean()),
-            'mean_difference': float(high.mean() - low.mean()),
+            'mean_with_likes': float(mean1),
+            'mean_without_likes': float(mean2),
+            'mean_difference': float(mean1 - mean2),
             'n_with_likes': int(n1),
             'n_without_likes': int(n2)
         }
@@ -302,9 +395,17 @@ def stage_2_statistical_tests(df):
         print("✓ T-Test: skipped (insufficient data)")
     
     # CORRELATION: RATING vs LIKES
-    corr_df = df[["rating_overall", "like_count"]].dropna()
-    if len(corr_df) > 2:
-        r, p_r = pearsonr(corr_df["rating_overall"], corr_df["like_count"])
+    if rating_likes is None:
+        corr_df = df[["rating_overall", "like_count"]].dropna().astype(float)
+        n_pairs = len(corr_df)
+        if n_pairs > 2:
+            r, p_r = pearsonr(corr_df["rating_overall"], corr_df["like_count"])
+    else:
+        n_pairs = rating_likes["pairs"]["count"]
+        if n_pairs > 2:
+            r, p_r = comoments_pearson(rating_likes["pairs"])
+    
+    if n_pairs > 2:
         result['correlation_rating_likes'] = {
             'pearson_r': float(r),
             'p_value': float(p_r),
@@ -320,8 +421,21 @@ def stage_2_statistical_tests(df):
 
 # ============ STAGE 3: OUTLIER DETECTION ============
 
-def stage_3_outlier_detection(df):
-    """Detect outliers and anomalies."""
+STATISTICAL_OUTLIER_KEYS = [
+    'rating_outliers_iqr',
+    'rating_outliers_zscore',
+    'likes_outliers_iqr',
+    'likes_outliers_zscore',
+    'restaurant_rating_outliers_iqr',
+]
+
+
+def stage_3_outlier_detection(df, statistical_outliers=None, anomalies=None):
+    """
+    Detect outliers and anomalies. statistical_outliers ({key: result}
+    for STATISTICAL_OUTLIER_KEYS) and anomalies (detect_anomalies
+    counts) may come precomputed; with both df may be None.
+    """
     print("\n" + "="*80)
     print("STAGE 3: OUTLIER DETECTION")
     print("="*80)
@@ -329,77 +443,49 @@ def stage_3_outlier_detection(df):
     result = {}
     
     # Statistical outliers
-    rating_iqr = detect_outliers_iqr(df['rating_overall'], 'rating_overall')
-    rating_zscore = detect_outliers_zscore(df['rating_overall'], 'rating_overall', threshold=3)
-    likes_iqr = detect_outliers_iqr(df.loc[df['like_count'] > 0, 'like_count'],'like_count_nonzero')
-    likes_zscore = detect_outliers_zscore(df['like_count'], 'like_count', threshold=3)
-    rest_rating_iqr = detect_outliers_iqr(df['restaurant_overall_rating'], 'restaurant_overall_rating')
-    
-    result['rating_outliers_iqr'] = rating_iqr
-    result['rating_outliers_zscore'] = rating_zscore
-    result['likes_outliers_iqr'] = likes_iqr
-    result['likes_outliers_zscore'] = likes_zscore
-    result['restaurant_rating_outliers_iqr'] = rest_rating_iqr
+    if statistical_outliers is None:
+        statistical_outliers = {
+            'rating_outliers_iqr': detect_outliers_iqr(df['rating_overall'], 'rating_overall'),
+            'rating_outliers_zscore': detect_outliers_zscore(df['rating_overall'], 'rating_overall', threshold=3),
+            'likes_outliers_iqr': detect_outliers_iqr(df.loc[df['like_count'] > 0, 'like_count'],'like_count_nonzero'),
+            'likes_outliers_zscore': detect_outliers_zscore(df['like_count'], 'like_count', threshold=3),
+            'restaurant_rating_outliers_iqr': detect_outliers_iqr(df['restaurant_overall_rating'], 'restaurant_overall_rating'),
+        }
+    for key in STATISTICAL_OUTLIER_KEYS:
+        result[key] = statistical_outliers[key]
     print("✓ Statistical outliers detected")
     
-    # Realistic anomalies
-    anomalies = []
-    like_99_percentile = df['like_count'].quantile(0.99)
-    
-    for idx, row in df.iterrows():
-        flags = []
-        
-        if row['restaurant_review_count'] >= 20:
-            if abs(row['rating_overall'] - row['restaurant_overall_rating']) > 3:
-                flags.append('outlier_vs_restaurant')
-        
-        if row['like_count'] > like_99_percentile and row['like_count'] > 5:
-            flags.append('viral_engagement')
-        
-        # if idx in rating_iqr['outlier_indices'] and row['like_count'] > df['like_count'].quantile(0.75):
-        #     flags.append('extreme_rating_with_engagement')
-        
-        if row['rating_overall'] <= 2 and row['like_count'] > like_99_percentile:
-            flags.append('low_rating_high_engagement')
-        
-        if len(flags) >= 2 or (len(flags) == 1 and flags[0] in ['viral_engagement', 'low_rating_high_engagement']):
-            anomalies.append({
-                'reviewer_name': row['reviewer_name'],
-                'rating_overall': float(row['rating_overall']),
-                'like_count': int(row['like_count']),
-                'restaurant_name': row['restaurant_name'],
-                'anomaly_flags': '; '.join(flags),
-                'flag_count': len(flags)
-            })
-    
-    # result['multivariate_anomalies'] = anomalies 
-    result['anomaly_count'] = len(anomalies)
-    result['anomaly_percentage'] = round(len(anomalies) / len(df) * 100, 2)
-    print(f"✓ Realistic anomalies detected: {len(anomalies)}")
+    # Realistic anomalies (see anomaly_engine for the rules)
+    if anomalies is None:
+        anomalies = detect_anomalies(df)
+
+    result['anomaly_count'] = anomalies['anomaly_count']
+    result['anomaly_percentage'] = anomalies['anomaly_percentage']
+    result['anomaly_flag_counts'] = anomalies['flag_counts']
+    print(f"✓ Realistic anomalies detected: {anomalies['anomaly_count']}")
     
     return result
 
 # ============ STAGE 4: TIME SERIES ANALYSIS ============
 
-def stage_4_time_series(df):
-    """Build time series tables."""
+def stage_4_time_series(df, group_stats=None, rollup=None, histogram=None):
+    """
+    Build time series tables (df may be None when group_stats and rollup
+    are given). With the rating histogram the daily and monthly tables
+    also carry median_rating.
+    """
     print("\n" + "=" * 80)
     print("STAGE 4: TIME SERIES ANALYSIS")
     print("=" * 80)
-
-    df['created_at'] = pd.to_datetime(df['created_at'], errors='coerce')
+    if group_stats is None:
+        group_stats = build_group_stats(df, keys=["primary_cuisine"])
+    # every series below is derived from the day-level rollup cube
+    if rollup is None:
+        rollup = build_time_rollup(df)
     result = {}
 
-    # THIS LINE MUST COME BEFORE ANY resample() CALLS
-    ts = df.set_index("created_at")
-
     # ================= DAILY: TOP 10 DAYS =================
-    daily_agg = ts.resample("D").agg(
-        mean_rating=("rating_overall", "mean"),
-        median_rating=("rating_overall", "median"),
-        rating_count=("rating_overall", "count"),
-        mean_likes=("like_count", "mean"),
-    )
+    daily_agg = rollup_series(rollup, "D", histogram=histogram)
     daily_agg["mean_rating_roll"] = daily_agg["mean_rating"].rolling(7, min_periods=1).mean()
     daily_agg["delta_rating"] = daily_agg["mean_rating"].diff()
 
@@ -420,12 +506,7 @@ def stage_4_time_series(df):
     print(f"✓ Daily time series (top {top_n_days} days by mean rating) computed")
 
     # ================= MONTHLY: TOP 3 MONTHS =================
-    monthly_agg = ts.resample("ME").agg(
-        mean_rating=("rating_overall", "mean"),
-        median_rating=("rating_overall", "median"),
-        rating_count=("rating_overall", "count"),
-        mean_likes=("like_count", "mean"),
-    )
+    monthly_agg = rollup_series(rollup, "ME", histogram=histogram)
     monthly_agg["mean_rating_roll"] = monthly_agg["mean_rating"].rolling(3, min_periods=1).mean()
     monthly_agg["delta_rating"] = monthly_agg["mean_rating"].diff()
 
@@ -447,12 +528,8 @@ def stage_4_time_series(df):
 
     # Monthly by city: keep top 3 cities per month by mean rating
     monthly_city_full = (
-        ts.groupby([pd.Grouper(freq="ME"), "city"])
-          .agg(
-              mean_rating=("rating_overall", "mean"),
-              rating_count=("rating_overall", "count"),
-              mean_likes=("like_count", "mean"),
-          )
+        rollup_series(rollup, "ME", by="city")[["mean_rating", "rating_count", "mean_likes"]]
+          .rename_axis(["created_at", "city"])
           .reset_index()
     )
 
@@ -473,11 +550,11 @@ def stage_4_time_series(df):
 
 
     # Top cuisines overall (across entire period)
-    cuisine_summary = (
-        df.groupby("primary_cuisine")["rating_overall"]
-          .agg(mean_rating="mean", rating_count="count")
-          .reset_index()
-    )
+    cuisine_stats = group_stats["primary_cuisine"]
+    cuisine_summary = pd.DataFrame({
+        "mean_rating": cuisine_stats["sum"] / cuisine_stats["count"],
+        "rating_count": cuisine_stats["count"],
+    }).reset_index()
 
     # keep only cuisines with enough reviews (tune this threshold if needed)
     cuisine_summary = cuisine_summary[cuisine_summary["rating_count"] >= 30]
@@ -498,42 +575,355 @@ def stage_4_time_series(df):
 
 # ============ MAIN EXECUTION ============
 
-def quantitative_analysis_runner(input_file):
+STAGE_EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+def _timed_call(func, args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, round(time.perf_counter() - start, 4)
+
+def run_stages(stages, executor=None, max_workers=None):
+    """
+    Run {name: (func, args)} serially (executor=None) or concurrently on
+    a "thread" or "process" pool. The stages only read their inputs, so
+    the results do not depend on the executor.
+    Returns ({name: result}, {name: wall seconds}).
+    """
+    if executor is None:
+        timed = {name: _timed_call(func, args) for name, (func, args) in stages.items()}
+    elif executor in STAGE_EXECUTORS:
+        with STAGE_EXECUTORS[executor](max_workers=max_workers or len(stages)) as pool:
+            futures = {
+                name: pool.submit(_timed_call, func, args)
+                for name, (func, args) in stages.items()
+            }
+            timed = {name: future.result() for name, future in futures.items()}
+    else:
+        raise ValueError(f"Unknown stage executor: {executor!r}")
+
+    results = {name: result for name, (result, _) in timed.items()}
+    timings = {name: seconds for name, (_, seconds) in timed.items()}
+    return results, timings
+
+
+# ============ STREAMING MODE ============
+# Every stage input reduced from chunks of the reviews, so the whole frame
+# is never loaded: column summaries (streaming_stats), per-group sums and
+# rating histograms, the t-test / correlation moments, the distinct
+# reviewers, the rollup cube and, when asked for, the day-level rating
+# histogram. All of them merge associatively. A
+# second pass counts anomalies against the 99th like percentile of the
+# first.
+#
+# Fields below come from quantile sketches. They are approximate
+# (normalized rank error ~0.17% at the default sketch size) once a column
+# has more values than the sketch holds; everything else is exact up to
+# float rounding (the number of reviewers up to 64-bit hash collisions).
+STREAMING_APPROXIMATE_FIELDS = [
+    'stage_1_descriptive_statistics.key_insights.Median Rating',
+    'stage_1_descriptive_statistics.overall_stats.*.25%',
+    'stage_1_descriptive_statistics.overall_stats.*.50%',
+    'stage_1_descriptive_statistics.overall_stats.*.75%',
+    'stage_3_outlier_detection.*_outliers_iqr.{Q1,Q3,IQR,lower_bound,upper_bound}',
+    'stage_3_outlier_detection.*_outliers_{iqr,zscore}.{outlier_count,outlier_percentage}',
+    'stage_3_outlier_detection.{anomaly_count,anomaly_percentage,anomaly_flag_counts}',
+]
+
+# the only columns the quantitative stages read
+STREAMING_REVIEW_COLUMNS = [
+    "created_at", "reviewer_name", "rating_overall", "like_count", "restaurant_name",
+    "city", "primary_cuisine", "restaurant_overall_rating", "restaurant_review_count",
+]
+
+
+def _chunked_frame(df, chunksize):
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+def partial_group_stats(df, keys=GROUP_STATS_KEYS, value="rating_overall"):
+    """
+    Mergeable form of build_group_stats: {key: {"sums", "hist"}}, the
+    same sums per group plus a (group, rating) histogram for the median.
+    """
+    values = df[value].astype("float64")
+    partial_stats = {}
+    for key in keys:
+        frame = pd.DataFrame({key: df[key], "value": values, "value_sq": values * values})
+        partial_stats[key] = {
+            "sums": frame.groupby(key, observed=True).agg(
+                count=("value", "count"),
+                sum=("value", "sum"),
+                sum_sq=("value_sq", "sum"),
+                min=("value", "min"),
+                max=("value", "max"),
+            ),
+            "hist": frame.groupby([key, "value"], observed=True).size(),
+        }
+    return partial_stats
+
+def merge_group_stats(a, b):
+    merged = {}
+    for key in a:
+        sums = pd.concat([a[key]["sums"], b[key]["sums"]]).groupby(level=0)
+        merged[key] = {
+            "sums": sums.agg({"count": "sum", "sum": "sum", "sum_sq": "sum", "min": "min", "max": "max"}),
+            "hist": pd.concat([a[key]["hist"], b[key]["hist"]]).groupby(level=[0, 1]).sum(),
+        }
+    return merged
+
+def finish_group_stats(partial_stats):
+    """build_group_stats output from merged partial_group_stats."""
+    group_stats = {}
+    for key, part in partial_stats.items():
+        hist = part["hist"]
+        medians = histogram_medians(hist[hist > 0])
+        group_stats[key] = part["sums"].assign(median=medians.reindex(part["sums"].index))
+    return group_stats
+
+
+def partial_rating_likes(df):
+    """Moments behind the stage 2 t-test and correlation."""
+    ratings = pd.to_numeric(df["rating_overall"], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    likes = pd.to_numeric(df["like_count"], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    return {
+        "with_likes": moments_from_values(ratings[likes > 0]),
+        "without_likes": moments_from_values(ratings[likes == 0]),
+        "pairs": comoments_from_values(ratings, likes),
+    }
+
+def merge_rating_likes(a, b):
+    return {
+        "with_likes": merge_moments(a["with_likes"], b["with_likes"]),
+        "without_likes": merge_moments(a["without_likes"], b["without_likes"]),
+        "pairs": merge_comoments(a["pairs"], b["pairs"]),
+    }
+
+
+def summarize_review_chunk(df, rating_histogram=False):
+    """Everything the streamed stages need from one chunk of reviews."""
+    created_at = df["created_at"]
+    if not pd.api.types.is_datetime64_any_dtype(created_at):
+        created_at = pd.to_datetime(created_at, errors="coerce")
+        df = df.assign(created_at=created_at)
+    reviewers = df["reviewer_name"].dropna().to_numpy(dtype=object)
+    return {
+        "stats": summarize_chunk(df),
+        "group_stats": partial_group_stats(df),
+        "rating_likes": partial_rating_likes(df),
+        "reviewers": np.unique(pd.util.hash_array(reviewers)),
+        "first_review": created_at.min(),
+        "last_review": created_at.max(),
+        "rollup": build_time_rollup(df),
+        "rating_histogram": build_rating_histogram(df) if rating_histogram else None,
+    }
+
+def merge_review_summaries(a, b):
+    return {
+        "stats": merge_summaries(a["stats"], b["stats"]),
+        "group_stats": merge_group_stats(a["group_stats"], b["group_stats"]),
+        "rating_likes": merge_rating_likes(a["rating_likes"], b["rating_likes"]),
+        "reviewers": np.union1d(a["reviewers"], b["reviewers"]),
+        "first_review": pd.Series([a["first_review"], b["first_review"]]).min(),
+        "last_review": pd.Series([a["last_review"], b["last_review"]]).max(),
+        "rollup": merge_time_rollups(a["rollup"], b["rollup"]),
+        "rating_histogram": (
+            merge_time_rollups(a["rating_histogram"], b["rating_histogram"])
+            if a["rating_histogram"] is not None else None
+        ),
+    }
+
+
+def streamed_key_insights(summary, group_stats):
+    """review_key_insights from a merged summarize_review_chunk result."""
+    stats = summary["stats"]
+    rating = stats["rating_overall"]["moments"]
+    likes = stats["like_count"]["moments"]
+    total = stats["rating_overall"]["rows"]
+    n_cities = len(group_stats["city"])
+    n_restaurants = len(group_stats["restaurant_name"])
+    n_liked = stats["like_count_nonzero"]["rows"]
+
+    def cv(moments):
+        return moments_std(moments) / moments["mean"] * 100 if moments["mean"] != 0 else 0
+
+    return {
+        'Dataset Scope': dataset_scope(n_cities, n_restaurants),
+        'Total Reviews': int(total),
+        'Date Range': f"{summary['first_review'].date()} to {summary['last_review'].date()}",
+        'Number of Cities': int(n_cities),
+        'Number of Restaurants': int(n_restaurants),
+        'Number of Cuisines': int(len(group_stats["primary_cuisine"])),
+        'Number of Reviewers': int(len(summary["reviewers"])),
+        'Average Rating': round(float(rating["mean"]), 2),
+        'Median Rating': float(sketch_quantiles(stats["rating_overall"]["sketch"], [0.5])[0]),
+        'Std Dev Rating': round(float(moments_std(rating)), 2),
+        'CV Rating (%)': round(float(cv(rating)), 2),
+        'Rating Range': f"{rating['min']:.0f} - {rating['max']:.0f}",
+        'Avg Likes per Review': round(float(likes["mean"]), 2),
+        'CV Likes (%)': round(float(cv(likes)), 2),
+        'Reviews with Likes': f"{n_liked} ({n_liked / total * 100:.1f}%)",
+    }
+
+
+def count_chunk_anomalies(df, thresholds):
+    found = detect_anomalies(df, thresholds=thresholds)
+    return {"rows": len(df), "anomaly_count": found["anomaly_count"], "flag_counts": found["flag_counts"]}
+
+def merge_anomaly_counts(a, b):
+    return {
+        "rows": a["rows"] + b["rows"],
+        "anomaly_count": a["anomaly_count"] + b["anomaly_count"],
+        "flag_counts": {name: n + b["flag_counts"][name] for name, n in a["flag_counts"].items()},
+    }
+
+
+def _streamed_stage_inputs(input_file, chunksize, max_workers, timings, rating_histogram=False):
+    """
+    Stage inputs for streaming mode from a path (read in chunks) or the
+    slices of an in-memory frame; timings gets the two passes.
+    """
+    def source():
+        if isinstance(input_file, pd.DataFrame):
+            return _chunked_frame(input_file, chunksize)
+        return input_file
+
+    summary, timings['streaming_summary'] = _timed_call(stream_reduce, (
+        source(), partial(summarize_review_chunk, rating_histogram=rating_histogram), merge_review_summaries,
+        chunksize, max_workers, STREAMING_REVIEW_COLUMNS
+    ))
+    if summary is None:
+        raise ValueError(f"No reviews to analyse in {input_file!r}")
+    streamed = quantitative_summary_report(summary["stats"])
+    group_stats = finish_group_stats(summary["group_stats"])
+
+    thresholds = {"like_99_percentile": streamed['like_99_percentile']}
+    counts, timings['streaming_anomalies'] = _timed_call(stream_reduce, (
+        source(), partial(count_chunk_anomalies, thresholds=thresholds), merge_anomaly_counts,
+        chunksize, max_workers, STREAMING_REVIEW_COLUMNS
+    ))
+    anomalies = {
+        "anomaly_count": counts["anomaly_count"],
+        "anomaly_percentage": round(counts["anomaly_count"] / counts["rows"] * 100, 2),
+        "flag_counts": counts["flag_counts"],
+    }
+
+    return {
+        "total_reviews": streamed['total_reviews'],
+        "first_review": summary["first_review"],
+        "last_review": summary["last_review"],
+        "group_stats": group_stats,
+        "key_insights": streamed_key_insights(summary, group_stats),
+        "overall_stats": streamed['overall_stats'],
+        "statistical_outliers": {key: streamed[key] for key in STATISTICAL_OUTLIER_KEYS},
+        "rating_likes": summary["rating_likes"],
+        "anomalies": anomalies,
+        "rollup": summary["rollup"],
+        "rating_histogram": summary["rating_histogram"],
+    }
+
+
+def quantitative_analysis_runner(
+    input_file, output_dir=OUTPUT_DIR, executor=None, max_workers=None,
+    streaming=False, chunksize=DEFAULT_CHUNKSIZE, rating_histogram=False
+):
+    """
+    input_file is a standardized reviews DataFrame or a path to one.
+    report_data.json and the time rollup cube (time_rollup.parquet) are
+    written to output_dir unless it is None.
+    executor="thread" / "process" runs the four stages concurrently
+    (see run_stages); per-stage wall times land in metadata.
+
+    streaming=True never builds the whole frame: every stage input is
+    reduced from `chunksize`-row chunks of the file (Parquet row groups
+    in parallel with max_workers), or from slices of input_file when it
+    is a DataFrame. See STREAMING_APPROXIMATE_FIELDS; each streamed
+    outlier result also carries an 'approximate' flag.
+
+    rating_histogram=True also builds the day-level rating histogram
+    (rating_histogram.parquet next to the cube) and adds median_rating
+    to the stage 4 daily and monthly tables.
+    """
     print("\n" + "="*80)
     print("COMBINED QUANTITATIVE ANALYSIS - ALL STAGES")
     print("="*80)
     
-    # Load data
-    df = pd.read_csv(input_file)
-    df['created_at'] = pd.to_datetime(df['created_at'], errors='coerce')
-    print(f"\n✓ Loaded {len(df)} reviews")
-    
+    if streaming:
+        df = None
+        timings = {}
+        streamed = _streamed_stage_inputs(
+            input_file, chunksize, max_workers or 1, timings, rating_histogram
+        )
+        total_reviews = streamed['total_reviews']
+        first_review, last_review = streamed['first_review'], streamed['last_review']
+        group_stats, rollup = streamed['group_stats'], streamed['rollup']
+        histogram = streamed['rating_histogram']
+        print(f"\n✓ Streamed {total_reviews} reviews")
+    else:
+        # Load data
+        df = as_frame(input_file)
+        if not pd.api.types.is_datetime64_any_dtype(df['created_at']):
+            df['created_at'] = pd.to_datetime(df['created_at'], errors='coerce')
+        total_reviews = len(df)
+        first_review, last_review = df['created_at'].min(), df['created_at'].max()
+        print(f"\n✓ Loaded {len(df)} reviews")
+        
+        # Per-group rating statistics shared by stages 1, 2 and 4
+        group_stats, group_stats_time = _timed_call(build_group_stats, (df,))
+        # day × city × cuisine × restaurant cube behind stage 4
+        rollup, rollup_time = _timed_call(build_time_rollup, (df,))
+        timings = {'group_stats': group_stats_time, 'time_rollup': rollup_time}
+        histogram = None
+        if rating_histogram:
+            histogram, timings['rating_histogram'] = _timed_call(build_rating_histogram, (df,))
+        streamed = {}
+
     # Run all stages
-    stage1_result = stage_1_descriptive_stats(df)
-    stage2_result = stage_2_statistical_tests(df)
-    stage3_result = stage_3_outlier_detection(df)
-    stage4_result = stage_4_time_series(df)
+    stage_results, stage_timings = run_stages({
+        'stage_1_descriptive_statistics': (stage_1_descriptive_stats, (
+            df, group_stats, streamed.get('overall_stats'), streamed.get('key_insights')
+        )),
+        'stage_2_statistical_tests': (stage_2_statistical_tests, (
+            df, group_stats, streamed.get('rating_likes')
+        )),
+        'stage_3_outlier_detection': (stage_3_outlier_detection, (
+            df, streamed.get('statistical_outliers'), streamed.get('anomalies')
+        )),
+        'stage_4_time_series': (stage_4_time_series, (df, group_stats, rollup, histogram)),
+    }, executor, max_workers)
     
     # Combine all results
     all_results = {
         'metadata': {
-            'total_reviews': len(df),
-            'date_range_start': str(df['created_at'].min().date()),
-            'date_range_end': str(df['created_at'].max().date()),
-            'generated_at': pd.Timestamp.now().isoformat()
+            'total_reviews': total_reviews,
+            'date_range_start': str(first_review.date()),
+            'date_range_end': str(last_review.date()),
+            'generated_at': pd.Timestamp.now().isoformat(),
+            'stage_executor': executor or 'serial',
+            'stage_timings_s': {**timings, **stage_timings},
+            **({'streaming_approximate_fields': STREAMING_APPROXIMATE_FIELDS} if streaming else {}),
         },
-        'stage_1_descriptive_statistics': stage1_result,
-        'stage_2_statistical_tests': stage2_result,
-        'stage_3_outlier_detection': stage3_result,
-        'stage_4_time_series': stage4_result
+        **stage_results
     }
     
-    # Save JSON
-    with open(f"{OUTPUT_DIR}report_data.json", 'w') as f:
-        json.dump(all_results, f, indent=2, default=str)
-    print("\n✓ Saved report_data.json")
     print("ALL ANALYSIS COMPLETE!")
-    print("Output Files:")
-    print("  1. report_data.json - Structured JSON for programmatic access")
+
+    # Save JSON
+    if output_dir is not None:
+        with open(os.path.join(output_dir, "report_data.json"), 'w') as f:
+            json.dump(all_results, f, indent=2, default=str)
+        write_frame(rollup, os.path.join(output_dir, ROLLUP_FILE))
+        histogram_path = os.path.join(output_dir, RATING_HISTOGRAM_FILE)
+        if histogram is not None:
+            write_frame(histogram, histogram_path)
+        elif os.path.exists(histogram_path):
+            # a histogram from an earlier run would not match this cube
+            os.remove(histogram_path)
+        print("\n✓ Saved report_data.json")
+        print("Output Files:")
+        print("  1. report_data.json - Structured JSON for programmatic access")
+        print(f"  2. {ROLLUP_FILE} - Day-level rollup cube for time window queries")
+        if histogram is not None:
+            print(f"  3. {RATING_HISTOGRAM_FILE} - Day-level rating histogram for medians")
 
     return all_results
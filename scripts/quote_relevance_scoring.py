@@ -1,21 +1,100 @@
 import json
+import numpy as np
 import pandas as pd
 import math
 from collections import Counter
 
+from .columnar_io import as_frame
+
+QUOTE_COLUMNS = ["review_id", "rating", "theme", "subtheme", "phrase"]
+
+
+def _normalized_codes(values):
+    """
+    Codes of astype(str).lower().strip() of `values`, with the labels in
+    sorted order. The string work runs once per distinct value.
+    """
+    raw_codes, raw_uniques = pd.factorize(values, use_na_sentinel=False)
+    normalized = pd.Index(raw_uniques).astype(str).str.lower().str.strip()
+    codes, uniques = pd.factorize(normalized, sort=True)
+    return codes[raw_codes], pd.Index(uniques)
+
+
+def _representative_rows(signal, score, rating, n_signals):
+    """
+    Row index of the best quote per signal: highest score, then lowest
+    rating, then first in input order. Returns one row per signal code.
+    """
+    best_score = np.full(n_signals, -np.inf)
+    np.maximum.at(best_score, signal, score)
+    candidates = np.flatnonzero(score == best_score[signal])
+
+    candidate_signal = signal[candidates]
+    candidate_rating = rating[candidates]
+    rated = ~np.isnan(candidate_rating)
+    best_rating = np.full(n_signals, np.inf)
+    np.minimum.at(best_rating, candidate_signal[rated], candidate_rating[rated])
+    has_rated = np.zeros(n_signals, dtype=bool)
+    has_rated[candidate_signal[rated]] = True
+
+    # unrated rows only stand in for signals without a rated candidate
+    keep = np.where(
+        has_rated[candidate_signal],
+        candidate_rating == best_rating[candidate_signal],
+        True,
+    )
+    candidates = candidates[keep]
+
+    # first remaining row of each signal (candidates are in input order)
+    _, first = np.unique(signal[candidates], return_index=True)
+    return candidates[first]
+
+
+def _top_k_order(scores, k):
+    """
+    Positions of the k highest scores, highest first, ties in position
+    order. Only the rows at or above the k-th score are sorted.
+    """
+    if k <= 0:
+        return np.array([], dtype=np.intp)
+    if k >= len(scores):
+        return np.lexsort((np.arange(len(scores)), -scores))
+    kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+    candidates = np.flatnonzero(scores >= kth)
+    return candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+
+
+def selected_signal_count(total_signals, top_k=5, top_fraction=None, fraction_min_signals=200):
+    """
+    How many signals to return: top_fraction of them when set and there
+    are more than fraction_min_signals, otherwise top_k (or all if fewer).
+    """
+    if top_fraction is not None and total_signals > fraction_min_signals:
+        return min(total_signals, math.ceil(total_signals * top_fraction))
+    return min(total_signals, top_k)
+
+
 def generate_top_relevant_unique_quotes(
-    themes_csv: str,
-    multitier_json: str,
-    output_csv: str,
-    vague_phrases: set = None
+    themes_csv,
+    multitier_json,
+    output_csv: str = None,
+    vague_phrases: set = None,
+    top_k: int = 5,
+    top_fraction: float = None,
+    fraction_min_signals: int = 200
 ):
     """
     Generates top relevant unique complaint quotes based on
     multi-tier importance + severity scoring.
 
-    Selection rule:
-    - If unique signals > 200 → top 5%
-    - Else → top 10 signals (or all if <10)
+    Selection rule (see selected_signal_count):
+    - top_k signals by default (5, or all if fewer)
+    - With top_fraction set: if unique signals > fraction_min_signals
+      → top top_fraction of them, else → top_k
+      (top_k=10, top_fraction=0.05 gives "top 5% if > 200, else top 10")
+
+    themes_csv / multitier_json may also be the in-memory theme rows and
+    multi-tier analysis dict; the CSV is only written when output_csv is set.
     """
 
     if vague_phrases is None:
@@ -27,14 +106,18 @@ def generate_top_relevant_unique_quotes(
     # =====================================================
     # LOAD DATA
     # =====================================================
-    df = pd.read_csv(themes_csv)
+    df = as_frame(themes_csv, columns=QUOTE_COLUMNS)
 
-    with open(multitier_json, "r", encoding="utf-8") as f:
-        analysis = json.load(f)
+    if isinstance(multitier_json, dict):
+        analysis = multitier_json
+    else:
+        with open(multitier_json, "r", encoding="utf-8") as f:
+            analysis = json.load(f)
 
-    # Normalize text
-    for col in ["phrase", "subtheme", "theme"]:
-        df[col] = df[col].astype(str).str.lower().str.strip()
+    # Normalize text (integer codes, labels in sorted order)
+    theme_codes, themes = _normalized_codes(df["theme"])
+    subtheme_codes, subthemes = _normalized_codes(df["subtheme"])
+    phrase_codes, phrases = _normalized_codes(df["phrase"])
 
     # =====================================================
     # STEP 1: GLOBAL IMPORTANCE WEIGHTS
@@ -65,56 +148,57 @@ def generate_top_relevant_unique_quotes(
     # =====================================================
     # STEP 2: SCORE COMPONENTS
     # =====================================================
+    # weights are looked up per distinct label, then gathered by code
 
-    df["severity"] = df["rating"].apply(lambda r: max(0.5, 3 - r))
-    df["theme_weight"] = df["theme"].map(tier1_weights).fillna(0.1)
-    df["subtheme_weight"] = df["subtheme"].map(tier2_weights).fillna(0.05)
-    df["phrase_weight"] = df["phrase"].map(phrase_weight).fillna(0.3)
+    rating = df["rating"].to_numpy(dtype="float64")
+    severity = np.fmax(3 - rating, 0.5)
+    theme_weights = themes.map(tier1_weights).fillna(0.1).to_numpy(dtype="float64")[theme_codes]
+    subtheme_weights = subthemes.map(tier2_weights).fillna(0.05).to_numpy(dtype="float64")[subtheme_codes]
+    phrase_weights = phrases.map(phrase_weight).fillna(0.3).to_numpy(dtype="float64")[phrase_codes]
 
-    df["specificity"] = df["phrase"].apply(
-        lambda p: 0.3 if p in vague_phrases else 1.0
-    )
+    specificity = np.where(phrases.isin(vague_phrases), 0.3, 1.0)[phrase_codes]
 
     # =====================================================
     # STEP 3: FINAL RELEVANCE SCORE
     # =====================================================
-    df["relevance_score"] = (
-        df["severity"]
-        * df["theme_weight"]
-        * df["subtheme_weight"]
-        * df["phrase_weight"]
-        * df["specificity"]
+    relevance_score = (
+        severity
+        * theme_weights
+        * subtheme_weights
+        * phrase_weights
+        * specificity
     )
 
     # =====================================================
     # STEP 4: CREATE SIGNAL KEY
     # =====================================================
-    df["signal_key"] = list(
-        zip(df["theme"], df["subtheme"], df["phrase"])
-    )
+    # codes are sorted per column, so signal codes follow the
+    # (theme, subtheme, phrase) order
+    signal_key = (
+        theme_codes.astype("int64") * len(subthemes) + subtheme_codes
+    ) * len(phrases) + phrase_codes
+    signal, signal_keys = pd.factorize(signal_key, sort=True)
+    total_signals = len(signal_keys)
 
     # =====================================================
     # STEP 5: ONE REPRESENTATIVE QUOTE PER SIGNAL
     # =====================================================
-    df_rep = (
-        df.sort_values(
-            ["relevance_score", "rating", "phrase"],
-            ascending=[False, True, False]
-        )
-        .groupby("signal_key", as_index=False)
-        .first()
-    )
+    rep_rows = _representative_rows(signal, relevance_score, rating, total_signals)
 
     # =====================================================
     # STEP 6: RANK & SELECT SIGNALS
     # =====================================================
-    df_rep = df_rep.sort_values("relevance_score", ascending=False)
+    n_selected = selected_signal_count(total_signals, top_k, top_fraction, fraction_min_signals)
+    top_rows = rep_rows[_top_k_order(relevance_score[rep_rows], n_selected)]
 
-    total_signals = len(df_rep)
-
-    df_top = (
-        df_rep.sort_values("relevance_score", ascending=False).head(5)
-    )
+    df_top = pd.DataFrame({
+        "review_id": df["review_id"].to_numpy()[top_rows],
+        "theme": themes[theme_codes[top_rows]],
+        "subtheme": subthemes[subtheme_codes[top_rows]],
+        "phrase": phrases[phrase_codes[top_rows]],
+        "rating": df["rating"].to_numpy()[top_rows],
+        "relevance_score": relevance_score[top_rows],
+    })
 
     # =====================================================
     # STEP 7: OUTPUT
@@ -128,10 +212,17 @@ def generate_top_relevant_unique_quotes(
         "relevance_score"
     ]
 
-    df_top[output_columns].to_csv(output_csv, index=False)
+    # review IDs are 64-bit hashes; JSON consumers (the report page) read
+    # numbers as doubles, which only hold 53 bits, so the ID goes out as a
+    # decimal string
+    df_top["review_id"] = df_top["review_id"].astype(str)
+
+    if output_csv:
+        df_top[output_columns].to_csv(output_csv, index=False)
 
     print("✅ Quote relevance scoring complete")
-    print(f"📄 Output file: {output_csv}")
+    if output_csv:
+        print(f"📄 Output file: {output_csv}")
     print(f"🔢 Unique signals ranked: {total_signals}")
     print(f"⭐ Top signals returned: {len(df_top)}")
 
@@ -1,37 +1,118 @@
-from .excel_ingestion import standardize_restaurant_reviews
+from .excel_ingestion import (
+    DEFAULT_CHUNKSIZE,
+    standardize_restaurant_reviews,
+    standardize_restaurant_reviews_chunked,
+)
 from .quantitative_analysis import quantitative_analysis_runner
-from .theme_extraction import run_theme_extraction
+from .theme_extraction import (
+    build_keyword_index,
+    build_theme_rows,
+    summarize_theme_rows,
+    build_theme_matrix,
+    write_theme_matrix,
+)
 from .multilayer_verbatim_analysis import run_full_multitier_analysis
 from .quote_relevance_scoring import generate_top_relevant_unique_quotes
+from .incremental_ingestion import (
+    ingest_incremental,
+    load_review_store,
+    append_theme_rows,
+    load_theme_store,
+)
+from .columnar_io import read_frame, write_frame
+from .text_corpus import build_text_corpus
+from .vocab_cache import compiled_vocabulary_source
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent
 
-OUTPUT_STANDARD_CSV = BASE_DIR / "standardized_output.csv"
+OUTPUT_STANDARD_PATH = BASE_DIR / "standardized_output.parquet"
+THEMES_PATH = BASE_DIR / "themes_test.parquet"
 THEME_KEYWORDS_JSON = BASE_DIR / "flattened_keywords.json"
-def run_all(INPUT_CSV):
+def run_all(
+    INPUT_CSV, chunksize=None, state_dir=None, theme_workers=1, export_dir=None,
+    quant_executor=None, theme_matrix_path=None, quant_streaming=False,
+    rating_histogram=False
+):
+    """
+    Stages hand DataFrames and dicts to each other in memory. Files are
+    only written when export_dir is given (the chunked ingestion path
+    still spills the standardized reviews to disk to bound memory).
+    quant_executor ("thread" / "process") runs the quantitative stages
+    concurrently; quant_streaming runs them over chunks of the reviews
+    with approximate quantiles, and rating_histogram adds the rating
+    histogram behind rollup medians (see quantitative_analysis_runner).
+    theme_matrix_path additionally writes the theme rows as a sparse
+    review x keyword matrix (.npz, see read_theme_matrix).
+    """
     print("Starting the full analysis pipeline...")
-    standardize_restaurant_reviews(INPUT_CSV, OUTPUT_STANDARD_CSV)
-    
+    export_dir = Path(export_dir) if export_dir is not None else None
+    if export_dir is not None:
+        export_dir.mkdir(parents=True, exist_ok=True)
+
+    if state_dir:
+        # incremental mode: only reviews not seen before are ingested
+        new_reviews = ingest_incremental(INPUT_CSV, state_dir)
+        reviews = load_review_store(state_dir)
+        print(f"New reviews: {len(new_reviews)} (corpus: {len(reviews)})")
+    elif chunksize:
+        standardized_path = export_dir / OUTPUT_STANDARD_PATH.name if export_dir else OUTPUT_STANDARD_PATH
+        parse_report = {}
+        standardize_restaurant_reviews_chunked(
+            INPUT_CSV, standardized_path, chunksize=chunksize, parse_report=parse_report
+        )
+        print(f"Unparsed created_at values: {parse_report.get('unparsed', 0)}")
+        reviews = read_frame(standardized_path)
+    else:
+        reviews = standardize_restaurant_reviews(INPUT_CSV)
+        print(f"Unparsed created_at values: {reviews.attrs['created_at_parse_report']['unparsed']}")
+
+    if export_dir is not None and not chunksize:
+        write_frame(reviews, export_dir / OUTPUT_STANDARD_PATH.name)
+
     print("✅ Standardization complete")
     # Performing quantitative analysis
     print("Starting quantitative analysis...")
-    quantitative_results=quantitative_analysis_runner(OUTPUT_STANDARD_CSV)
-
+    quantitative_results=quantitative_analysis_runner(
+        reviews, output_dir=export_dir, executor=quant_executor,
+        streaming=quant_streaming, chunksize=chunksize or DEFAULT_CHUNKSIZE,
+        rating_histogram=rating_histogram
+    )
     print("✅ Quantitative analysis complete")
+
+    # one lowercase / normalize / tokenize pass shared by the text analyzers
+    corpus = build_text_corpus(reviews["review_text"])
+
     # Theme extraction
 
     print("Starting theme extraction...")
-    theme_insights_results=run_theme_extraction(OUTPUT_STANDARD_CSV, THEME_KEYWORDS_JSON,"themes_test.csv")
+    keyword_index = compiled_vocabulary_source(THEME_KEYWORDS_JSON, build_keyword_index)
+    if state_dir:
+        append_theme_rows(state_dir, build_theme_rows(
+            new_reviews, keyword_index, n_workers=theme_workers
+        ))
+        themes_df = load_theme_store(state_dir)
+    else:
+        themes_df = build_theme_rows(
+            reviews, keyword_index, n_workers=theme_workers, corpus=corpus
+        )
+    theme_insights_results = summarize_theme_rows(themes_df, len(reviews))
+    if export_dir is not None:
+        write_frame(themes_df, export_dir / THEMES_PATH.name)
+    if theme_matrix_path is not None:
+        write_theme_matrix(build_theme_matrix(themes_df), theme_matrix_path)
 
     # Multilayer verbatim analysis
-    qualitative_multilayer_verbatim=run_full_multitier_analysis()
+    qualitative_multilayer_verbatim=run_full_multitier_analysis(
+        reviews, themes_df, corpus=corpus,
+        output_path=export_dir / "multitier_analysis_output.json" if export_dir else None
+    )
 
     # Quote relevance scoring
     qualitative_quote_relevant=generate_top_relevant_unique_quotes(
-        themes_csv="themes_test.csv",
-        multitier_json="multitier_analysis_output.json",
-        output_csv="top_relevant_unique_quotes.csv"
+        themes_df,
+        qualitative_multilayer_verbatim,
+        output_csv=export_dir / "top_relevant_unique_quotes.csv" if export_dir else None
     )
 
     print("All processes completed successfully.")
@@ -0,0 +1,476 @@
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from scipy import stats
+
+from .columnar_io import frame_format, iter_frame_chunks
+from .excel_ingestion import DEFAULT_CHUNKSIZE, iter_parallel_mapped
+
+# =========================
+# STREAMING (OUT-OF-CORE) STATISTICS
+# =========================
+# Descriptive statistics and the IQR / z-score outlier checks computed
+# from chunks instead of one in-memory frame. Each chunk is reduced to
+# small accumulators that merge associatively, so partitions can be
+# summarized in parallel and combined in any order:
+#
+#   moments   count, mean, M2 (sum of squared deviations), min, max,
+#             merged with Chan et al.'s parallel form of Welford's update
+#             — exact up to float rounding.
+#   comoments count, means and co-moments of a pair of columns, merged
+#             the same way — exact Pearson correlation.
+#   sketch    KLL quantile sketch (Karnin, Lang, Liberty 2016). Level h
+#             holds items of weight 2**h; a full level is sorted and every
+#             other item promoted, so memory stays O(k) whatever the row
+#             count.
+#
+# Quantile error: a sketch answers rank queries to within about
+# ±3.3/k · n (normalized rank error ~0.17% at the default k=2000, with
+# high probability; e.g. the reported median lies between the 49.83th
+# and 50.17th percentiles). Until a sketch compacts for the first time
+# (n <= k) it holds every value and quantiles are exact, with the same
+# linear interpolation as pandas. Outlier counts read off the sketch
+# carry the same rank error.
+
+DEFAULT_SKETCH_K = 2000
+
+STREAMING_COLUMNS = [
+    "rating_overall", "like_count", "restaurant_overall_rating", "restaurant_review_count"
+]
+
+DESCRIBE_QUANTILES = {"25%": 0.25, "50%": 0.5, "75%": 0.75}
+
+
+# =========================
+# MOMENTS (WELFORD / CHAN)
+# =========================
+
+def moments_from_values(values):
+    values = np.asarray(values, dtype="float64")
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return {"count": 0, "mean": np.nan, "m2": 0.0, "min": np.nan, "max": np.nan}
+    mean = values.mean()
+    return {
+        "count": len(values),
+        "mean": mean,
+        "m2": float(((values - mean) ** 2).sum()),
+        "min": values.min(),
+        "max": values.max(),
+    }
+
+
+def merge_moments(a, b):
+    if not a["count"]:
+        return dict(b)
+    if not b["count"]:
+        return dict(a)
+    n = a["count"] + b["count"]
+    delta = b["mean"] - a["mean"]
+    return {
+        "count": n,
+        "mean": a["mean"] + delta * b["count"] / n,
+        "m2": a["m2"] + b["m2"] + delta ** 2 * a["count"] * b["count"] / n,
+        "min": min(a["min"], b["min"]),
+        "max": max(a["max"], b["max"]),
+    }
+
+
+def moments_std(moments, ddof=1):
+    n = moments["count"]
+    return np.sqrt(moments["m2"] / (n - ddof)) if n > ddof else np.nan
+
+
+def comoments_from_values(x, y):
+    """Moments of the pairs where both x and y are present."""
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    keep = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[keep], y[keep]
+    if not len(x):
+        return {"count": 0, "mean_x": np.nan, "mean_y": np.nan, "cxx": 0.0, "cyy": 0.0, "cxy": 0.0}
+    dx, dy = x - x.mean(), y - y.mean()
+    return {
+        "count": len(x),
+        "mean_x": x.mean(),
+        "mean_y": y.mean(),
+        "cxx": float((dx * dx).sum()),
+        "cyy": float((dy * dy).sum()),
+        "cxy": float((dx * dy).sum()),
+    }
+
+
+def merge_comoments(a, b):
+    if not a["count"]:
+        return dict(b)
+    if not b["count"]:
+        return dict(a)
+    n = a["count"] + b["count"]
+    dx = b["mean_x"] - a["mean_x"]
+    dy = b["mean_y"] - a["mean_y"]
+    weight = a["count"] * b["count"] / n
+    return {
+        "count": n,
+        "mean_x": a["mean_x"] + dx * b["count"] / n,
+        "mean_y": a["mean_y"] + dy * b["count"] / n,
+        "cxx": a["cxx"] + b["cxx"] + dx * dx * weight,
+        "cyy": a["cyy"] + b["cyy"] + dy * dy * weight,
+        "cxy": a["cxy"] + b["cxy"] + dx * dy * weight,
+    }
+
+
+def comoments_pearson(comoments):
+    """Pearson r and two-sided p-value, as scipy.stats.pearsonr gives."""
+    n = comoments["count"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = comoments["cxy"] / np.sqrt(comoments["cxx"] * comoments["cyy"])
+    r = float(np.clip(r, -1.0, 1.0))
+    # same null distribution scipy uses: r ~ Beta(n/2 - 1, n/2 - 1) on [-1, 1]
+    dist = stats.beta(n / 2 - 1, n / 2 - 1, loc=-1, scale=2)
+    return r, float(2 * dist.sf(abs(r)))
+
+
+# =========================
+# RATING HISTOGRAMS
+# =========================
+
+def histogram_medians(hist):
+    """
+    Median per group from a value histogram Series indexed by
+    (*group keys, value), sorted, counts > 0. Even counts average the
+    two middle values, like pandas.
+    """
+    counts = hist.to_numpy(dtype="int64")
+    values = hist.index.get_level_values(-1).to_numpy(dtype="float64")
+    groups = hist.index.droplevel(-1)
+    codes, uniques = pd.factorize(groups)
+
+    cum = np.cumsum(counts)
+    totals = np.bincount(codes, weights=counts).astype("int64")
+    before = np.concatenate([[0], np.cumsum(totals)[:-1]])
+
+    lower = np.searchsorted(cum, before + (totals - 1) // 2, side="right")
+    upper = np.searchsorted(cum, before + totals // 2, side="right")
+    return pd.Series((values[lower] + values[upper]) / 2, index=uniques)
+
+
+# =========================
+# KLL QUANTILE SKETCH
+# =========================
+
+def new_quantile_sketch(k=DEFAULT_SKETCH_K):
+    return {"k": k, "n": 0, "levels": [np.empty(0)], "compactions": 0}
+
+
+def _level_capacity(k, height, level):
+    # capacities shrink by 2/3 per level below the top one
+    return max(2, int(np.ceil(k * (2 / 3) ** (height - level - 1))))
+
+
+def _compress(sketch):
+    levels = sketch["levels"]
+    level = 0
+    while level < len(levels):
+        if len(levels[level]) <= _level_capacity(sketch["k"], len(levels), level):
+            level += 1
+            continue
+
+        items = np.sort(levels[level])
+        held = items[len(items) - len(items) % 2:]
+        items = items[:len(items) - len(items) % 2]
+
+        # alternate which half survives so promotions stay unbiased
+        offset = sketch["compactions"] % 2
+        sketch["compactions"] += 1
+
+        grew = level + 1 == len(levels)
+        if grew:
+            levels.append(np.empty(0))
+        levels[level + 1] = np.concatenate([levels[level + 1], items[offset::2]])
+        levels[level] = held
+
+        # a taller sketch lowers every capacity below the top
+        level = 0 if grew else level + 1
+
+
+def sketch_update(sketch, values):
+    values = np.asarray(values, dtype="float64")
+    values = values[~np.isnan(values)]
+    sketch["levels"][0] = np.concatenate([sketch["levels"][0], values])
+    sketch["n"] += len(values)
+    _compress(sketch)
+    return sketch
+
+
+def merge_sketches(a, b):
+    height = max(len(a["levels"]), len(b["levels"]))
+    empty = np.empty(0)
+    merged = {
+        "k": a["k"],
+        "n": a["n"] + b["n"],
+        "levels": [
+            np.concatenate([
+                a["levels"][h] if h < len(a["levels"]) else empty,
+                b["levels"][h] if h < len(b["levels"]) else empty,
+            ])
+            for h in range(height)
+        ],
+        "compactions": a["compactions"] + b["compactions"],
+    }
+    _compress(merged)
+    return merged
+
+
+def sketch_is_exact(sketch):
+    """True while the sketch still holds every value it was fed."""
+    return len(sketch["levels"]) == 1
+
+
+def _weighted_items(sketch):
+    items = np.concatenate(sketch["levels"])
+    weights = np.concatenate([
+        np.full(len(level), 2.0 ** h) for h, level in enumerate(sketch["levels"])
+    ])
+    order = np.argsort(items, kind="stable")
+    return items[order], np.cumsum(weights[order])
+
+
+def sketch_quantiles(sketch, qs):
+    """Estimated quantiles for the probabilities in `qs`."""
+    qs = np.asarray(qs, dtype="float64")
+    if not sketch["n"]:
+        return np.full(qs.shape, np.nan)
+    if sketch_is_exact(sketch):
+        return np.quantile(sketch["levels"][0], qs)
+    items, cum_weight = _weighted_items(sketch)
+    positions = np.searchsorted(cum_weight, qs * cum_weight[-1], side="left")
+    return items[np.minimum(positions, len(items) - 1)]
+
+
+def sketch_rank(sketch, value, inclusive=False):
+    """Estimated number of values < value (<= with inclusive=True)."""
+    if not sketch["n"]:
+        return 0.0
+    items, cum_weight = _weighted_items(sketch)
+    i = np.searchsorted(items, value, side="right" if inclusive else "left")
+    return float(cum_weight[i - 1]) if i else 0.0
+
+
+# =========================
+# COLUMN SUMMARIES
+# =========================
+
+def _float_values(series):
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def summarize_chunk(df, columns=STREAMING_COLUMNS, k=DEFAULT_SKETCH_K):
+    """
+    {column: {"rows", "moments", "sketch"}} for one chunk, plus
+    "like_count_nonzero" (the population the likes IQR check uses).
+    """
+    summary = {}
+    for column in columns:
+        values = _float_values(df[column])
+        summary[column] = {
+            "rows": len(values),
+            "moments": moments_from_values(values),
+            "sketch": sketch_update(new_quantile_sketch(k), values),
+        }
+        if column == "like_count":
+            nonzero = values[values > 0]
+            summary["like_count_nonzero"] = {
+                "rows": len(nonzero),
+                "moments": moments_from_values(nonzero),
+                "sketch": sketch_update(new_quantile_sketch(k), nonzero),
+            }
+    return summary
+
+
+def merge_summaries(a, b):
+    if a is None:
+        return b
+    return {
+        column: {
+            "rows": a[column]["rows"] + b[column]["rows"],
+            "moments": merge_moments(a[column]["moments"], b[column]["moments"]),
+            "sketch": merge_sketches(a[column]["sketch"], b[column]["sketch"]),
+        }
+        for column in a
+    }
+
+
+def merge_all_summaries(summaries):
+    summary = None
+    for part in summaries:
+        summary = merge_summaries(summary, part)
+    return summary
+
+
+def summarize_chunks(chunks, columns=STREAMING_COLUMNS, k=DEFAULT_SKETCH_K):
+    return merge_all_summaries(summarize_chunk(chunk, columns, k) for chunk in chunks)
+
+
+def _summarize_row_group(file_path, part):
+    """Worker: summarize(one Parquet row group)."""
+    row_group, columns, summarize = part
+    df = pq.ParquetFile(file_path).read_row_group(row_group, columns=columns).to_pandas()
+    return summarize(df)
+
+
+def stream_reduce(
+    source,
+    summarize,
+    merge,
+    chunksize=DEFAULT_CHUNKSIZE,
+    max_workers=1,
+    columns=None
+):
+    """
+    summarize() every chunk of `source` and fold the results with merge();
+    None for an empty source. `source` is a file path or an iterable of
+    DataFrame chunks. Parquet row groups are summarized in parallel when
+    max_workers != 1 (None = all CPUs), so summarize must then pickle (a
+    module-level function or a functools.partial of one); other formats
+    are streamed in `chunksize` rows.
+    """
+    if isinstance(source, (str, bytes)) or hasattr(source, "__fspath__"):
+        if frame_format(source) == "parquet" and max_workers != 1:
+            parts = [
+                (i, columns, summarize) for i in range(pq.ParquetFile(source).num_row_groups)
+            ]
+            summaries = iter_parallel_mapped(_summarize_row_group, source, parts, max_workers)
+        else:
+            summaries = map(summarize, iter_frame_chunks(source, chunksize, columns))
+    else:
+        summaries = map(summarize, source)
+
+    result = None
+    for part in summaries:
+        result = part if result is None else merge(result, part)
+    return result
+
+
+def summarize_file(
+    file_path,
+    chunksize=DEFAULT_CHUNKSIZE,
+    max_workers=1,
+    columns=STREAMING_COLUMNS,
+    k=DEFAULT_SKETCH_K
+):
+    """
+    Summary of a standardized reviews file without loading it whole
+    (see stream_reduce for chunking and parallelism).
+    """
+    return stream_reduce(
+        file_path, partial(summarize_chunk, columns=columns, k=k), merge_summaries,
+        chunksize, max_workers, columns
+    )
+
+
+# =========================
+# REPORT OUTPUTS
+# =========================
+
+def streaming_describe(summary):
+    """DataFrame.describe().to_dict() plus 'cv_%', from a summary."""
+    described = {}
+    cv = {}
+    for column in STREAMING_COLUMNS:
+        if column not in summary:
+            continue
+        moments = summary[column]["moments"]
+        std = moments_std(moments)
+        quartiles = sketch_quantiles(summary[column]["sketch"], list(DESCRIBE_QUANTILES.values()))
+        described[column] = {
+            "count": float(moments["count"]),
+            "mean": float(moments["mean"]),
+            "std": float(std),
+            "min": float(moments["min"]),
+            **{name: float(q) for name, q in zip(DESCRIBE_QUANTILES, quartiles)},
+            "max": float(moments["max"]),
+        }
+        cv[column] = float(std / moments["mean"] * 100) if moments["mean"] != 0 else 0
+    described["cv_%"] = cv
+    return described
+
+
+def streaming_outliers_iqr(column_summary, column_name, multiplier=1.5):
+    """Same fields as quantitative_analysis.detect_outliers_iqr."""
+    sketch = column_summary["sketch"]
+    q1, q3 = sketch_quantiles(sketch, [0.25, 0.75])
+    iqr = q3 - q1
+    lower_bound = q1 - multiplier * iqr
+    upper_bound = q3 + multiplier * iqr
+    outlier_count = sketch_rank(sketch, lower_bound) + (
+        sketch["n"] - sketch_rank(sketch, upper_bound, inclusive=True)
+    )
+    return {
+        'column': column_name,
+        'Q1': float(q1),
+        'Q3': float(q3),
+        'IQR': float(iqr),
+        'lower_bound': float(lower_bound),
+        'upper_bound': float(upper_bound),
+        'outlier_count': int(round(outlier_count)),
+        'outlier_percentage': float(outlier_count / column_summary["rows"] * 100),
+        'approximate': not sketch_is_exact(sketch),
+    }
+
+
+def streaming_outliers_zscore(column_summary, column_name, threshold=3):
+    """Same fields as quantitative_analysis.detect_outliers_zscore."""
+    moments = column_summary["moments"]
+    sketch = column_summary["sketch"]
+    # scipy's zscore uses the population standard deviation
+    spread = threshold * moments_std(moments, ddof=0)
+    outlier_count = sketch_rank(sketch, moments["mean"] - spread) + (
+        sketch["n"] - sketch_rank(sketch, moments["mean"] + spread, inclusive=True)
+    )
+    return {
+        'column': column_name,
+        'mean': float(moments["mean"]),
+        'std_dev': float(moments_std(moments)),
+        'threshold': threshold,
+        'outlier_count': int(round(outlier_count)),
+        'outlier_percentage': float(outlier_count / column_summary["rows"] * 100),
+        'approximate': not sketch_is_exact(sketch),
+    }
+
+
+def quantitative_summary_report(summary):
+    """
+    Overall statistics (stage 1), statistical outliers (stage 3) and the
+    99th like percentile the anomaly rules use, from a column summary.
+    """
+    return {
+        'total_reviews': summary["rating_overall"]["rows"],
+        'overall_stats': streaming_describe(summary),
+        'rating_outliers_iqr': streaming_outliers_iqr(summary["rating_overall"], 'rating_overall'),
+        'rating_outliers_zscore': streaming_outliers_zscore(summary["rating_overall"], 'rating_overall', threshold=3),
+        'likes_outliers_iqr': streaming_outliers_iqr(summary["like_count_nonzero"], 'like_count_nonzero'),
+        'likes_outliers_zscore': streaming_outliers_zscore(summary["like_count"], 'like_count', threshold=3),
+        'restaurant_rating_outliers_iqr': streaming_outliers_iqr(
+            summary["restaurant_overall_rating"], 'restaurant_overall_rating'
+        ),
+        'like_99_percentile': float(sketch_quantiles(summary["like_count"]["sketch"], [0.99])[0]),
+    }
+
+
+def streaming_quantitative_summary(
+    source,
+    chunksize=DEFAULT_CHUNKSIZE,
+    max_workers=1,
+    k=DEFAULT_SKETCH_K
+):
+    """
+    quantitative_summary_report over `source`, a file path or an
+    iterable of DataFrame chunks.
+    """
+    summary = stream_reduce(
+        source, partial(summarize_chunk, k=k), merge_summaries,
+        chunksize, max_workers, STREAMING_COLUMNS
+    )
+    return quantitative_summary_report(summary)
@@ -0,0 +1,47 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# =========================
+# SHARED TEXT CORPUS
+# =========================
+# Review text is lowercased, normalized and tokenized once per run and the
+# arrays are shared by every text analyzer:
+#   lowered       str.lower() of each review   (rule + dish substring scans)
+#   normalized    same as theme_extraction.normalize_text (phrase matching)
+#   token_offsets review i owns token_ids[token_offsets[i]:token_offsets[i + 1]]
+#   token_ids     ids into `vocab` of the whitespace tokens of `normalized`
+#   vocab         distinct tokens, in first-appearance order
+
+
+def normalize_lowered(lowered):
+    """
+    Vectorized normalize_text for already-lowercased text: every run of
+    characters outside a-z becomes one space, ends stripped. That is what
+    the two-regex version does too, since only a-z and spaces survive it.
+    """
+    collapsed = pc.replace_substring_regex(pa.array(lowered, type=pa.string()), r"[^a-z]+", " ")
+    return pc.utf8_trim_whitespace(collapsed)
+
+
+def build_text_corpus(texts):
+    # Python's lower() (full Unicode case mapping) so the analyzers see
+    # exactly the text they saw before
+    lowered = np.array([str(t).lower() for t in texts], dtype=object)
+    normalized = normalize_lowered(lowered)
+
+    tokens = pc.split_pattern(normalized, " ")
+    flat = pc.list_flatten(tokens)
+    owner = pc.list_parent_indices(tokens).to_numpy()
+    keep = pc.not_equal(flat, "").to_numpy(zero_copy_only=False)
+
+    encoded = pc.dictionary_encode(flat.filter(pa.array(keep)))
+    counts = np.bincount(owner[keep], minlength=len(lowered))
+
+    return {
+        "lowered": lowered,
+        "normalized": normalized.to_numpy(zero_copy_only=False),
+        "token_offsets": np.concatenate([[0], np.cumsum(counts)]),
+        "token_ids": encoded.indices.to_numpy().astype(np.int32),
+        "vocab": encoded.dictionary.to_numpy(zero_copy_only=False),
+    }
@@ -1,6 +1,14 @@
 import re
-import json
+import os
+import numpy as np
 import pandas as pd
+import scipy.sparse as sp
+from concurrent.futures import ProcessPoolExecutor
+
+from .columnar_io import as_frame, write_frame
+from .phrase_matcher import build_phrase_automaton, match_phrase_ids
+from .vocab_cache import compiled_vocabulary_source, read_compiled_vocabulary
+from .text_corpus import build_text_corpus
 
 # =========================
 # STOPWORDS (SAFE LIST)
@@ -22,26 +30,66 @@ def normalize_text(text: str) -> str:
     text = re.sub(r"\s+", " ", text).strip()
     return text
 
+# =========================
+# KEYWORD INDEX
+# =========================
+def split_keywords(flat_keywords):
+    phrase_keywords = [k for k in flat_keywords if " " in k["phrase"]]
+    token_keywords  = [k for k in flat_keywords if " " not in k["phrase"]]
+    return phrase_keywords, token_keywords
+
+
+def build_keyword_index(flat_keywords):
+    """
+    Compile the flattened keywords once per run. Multi-word phrases go
+    into one Aho–Corasick automaton and single words into a token -> entry
+    ids dict, so matching cost follows the review length, not the
+    vocabulary size.
+    """
+    phrase_keywords, token_keywords = split_keywords(flat_keywords)
+
+    token_index = {}
+    for i, item in enumerate(token_keywords):
+        token_index.setdefault(item["phrase"], []).append(i)
+
+    return {
+        "phrase_keywords": phrase_keywords,
+        "token_keywords": token_keywords,
+        "token_index": token_index,
+        "phrase_automaton": build_phrase_automaton(
+            [k["phrase"] for k in phrase_keywords]
+        ),
+    }
+
 # =========================
 # THEME EXTRACTION (CORE ENGINE)
 # =========================
-def extract_themes(review_text: str, phrase_keywords, token_keywords):
-    clean_text = normalize_text(review_text)
-    tokens = clean_text.split()
-    filtered_tokens = [t for t in tokens if t not in STOPWORDS]
+def extract_themes(review_text: str, keyword_index):
+    return match_normalized_text(normalize_text(review_text), keyword_index)
 
-    hits = []
 
-    # 1️⃣ Phrase matching (highest precision)
-    for item in phrase_keywords:
-        if item["phrase"] in clean_text:
-            hits.append(item)
+def match_normalized_text(clean_text: str, keyword_index, token_keyword_ids=None):
+    """
+    `token_keyword_ids` — sorted ids of the single-word keywords among the
+    text's tokens — may come precomputed from the shared corpus.
+    """
+    phrase_keywords = keyword_index["phrase_keywords"]
+    token_keywords = keyword_index["token_keywords"]
 
-    # 2️⃣ Token matching (fallback)
-    token_set = set(filtered_tokens)
-    for item in token_keywords:
-        if item["phrase"] in token_set:
-            hits.append(item)
+    # 1️⃣ Phrase matching (highest precision), in keyword-file order
+    phrase_ids = match_phrase_ids(keyword_index["phrase_automaton"], clean_text)
+    hits = [phrase_keywords[i] for i in sorted(phrase_ids)]
+
+    # 2️⃣ Token matching (fallback), looked up per review token
+    if token_keyword_ids is None:
+        token_index = keyword_index["token_index"]
+        filtered_tokens = [t for t in clean_text.split() if t not in STOPWORDS]
+        token_keyword_ids = sorted(
+            i
+            for token in set(filtered_tokens) if token in token_index
+            for i in token_index[token]
+        )
+    hits.extend(token_keywords[i] for i in token_keyword_ids)
 
     # 3️⃣ Deduplicate matches
     unique_hits = {
@@ -104,6 +152,12 @@ def analyze_recurring_theme_concerns_json(
         .reset_index()
     )
 
+    return _rank_theme_concerns(
+        agg, min_review_coverage, negative_ratio_threshold, max_avg_rating, top_k
+    )
+
+
+def _rank_theme_concerns(agg, min_review_coverage, negative_ratio_threshold, max_avg_rating, top_k):
     agg["negative_ratio"] = agg["negative_mentions"] / agg["total_mentions"]
     agg["concern_score"] = (
         agg["unique_reviews"]
@@ -121,49 +175,370 @@ def analyze_recurring_theme_concerns_json(
 
 
 # =========================
-# 🚀 MAIN REUSABLE FUNCTION
+# SPARSE REVIEW × KEYWORD OUTPUT
 # =========================
-def run_theme_extraction(
-    input_csv: str,
-    flattened_keywords_json: str,
-    output_csv: str,
-    review_text_column: str = "review_text",
-    rating_column: str = "rating_overall"
+# A compact alternative to the long theme-row table: one CSR row per
+# review_id, one column per distinct (theme, subtheme, polarity, phrase),
+# values = number of theme rows. Ingestion IDs are unique per row, but the
+# count keeps every aggregate of the row table recoverable even when a
+# frame from elsewhere repeats a review_id.
+KEYWORD_COLUMNS = ["theme", "subtheme", "polarity", "phrase"]
+
+
+def build_theme_matrix(themes_df: pd.DataFrame):
+    review_codes, review_ids = pd.factorize(themes_df["review_id"])
+    keyword_codes, keywords = pd.factorize(
+        pd.MultiIndex.from_frame(themes_df[KEYWORD_COLUMNS])
+    )
+
+    matrix = sp.csr_matrix(
+        (np.ones(len(themes_df), dtype=np.int32), (review_codes, keyword_codes)),
+        shape=(len(review_ids), len(keywords))
+    )
+
+    # every row of a review_id carries the same rating
+    rating = np.full(len(review_ids), np.nan)
+    rating[review_codes] = themes_df["rating"].to_numpy(dtype=float)
+
+    return {
+        "matrix": matrix,
+        "review_id": np.asarray(review_ids),
+        "rating": rating,
+        "keywords": keywords.to_frame(index=False, name=KEYWORD_COLUMNS),
+    }
+
+
+def write_theme_matrix(theme_matrix, path):
+    matrix = theme_matrix["matrix"]
+    keywords = theme_matrix["keywords"]
+    with open(path, "wb") as f:
+        np.savez_compressed(
+            f,
+            data=matrix.data,
+            indices=matrix.indices,
+            indptr=matrix.indptr,
+            shape=np.asarray(matrix.shape),
+            review_id=theme_matrix["review_id"],
+            rating=theme_matrix["rating"],
+            **{f"keyword_{c}": keywords[c].to_numpy(dtype=str) for c in KEYWORD_COLUMNS}
+        )
+
+
+def read_theme_matrix(path):
+    with np.load(path) as npz:
+        return {
+            "matrix": sp.csr_matrix(
+                (npz["data"], npz["indices"], npz["indptr"]), shape=tuple(npz["shape"])
+            ),
+            "review_id": npz["review_id"],
+            "rating": npz["rating"],
+            "keywords": pd.DataFrame({c: npz[f"keyword_{c}"] for c in KEYWORD_COLUMNS}),
+        }
+
+
+def summarize_theme_groups(theme_matrix, by=("theme", "subtheme"), keyword_mask=None):
+    """
+    Per-group totals as sparse reductions: mentions, distinct reviews,
+    negative mentions and mean rating over mentions. `keyword_mask`
+    (bool per keyword column) restricts which keywords count.
+    """
+    matrix = theme_matrix["matrix"]
+    keywords = theme_matrix["keywords"]
+    rating = theme_matrix["rating"]
+
+    group_codes, groups = pd.factorize(
+        pd.MultiIndex.from_frame(keywords[list(by)]), sort=True
+    )
+    weight = np.ones(len(keywords), dtype=np.int64)
+    if keyword_mask is not None:
+        weight[~np.asarray(keyword_mask)] = 0
+    negative = (keywords["polarity"] == "negative").to_numpy()
+
+    def grouping(w):
+        return sp.csr_matrix(
+            (w, (np.arange(len(keywords)), group_codes)), shape=(len(keywords), len(groups))
+        )
+
+    # reviews × groups mention counts
+    per_review = matrix @ grouping(weight)
+    per_review.eliminate_zeros()
+    rated = ~np.isnan(rating)
+
+    summary = groups.to_frame(index=False, name=list(by))
+    summary["total_mentions"] = np.asarray(per_review.sum(axis=0)).ravel().astype(np.int64)
+    summary["unique_reviews"] = per_review.getnnz(axis=0).astype(np.int64)
+    summary["negative_mentions"] = (
+        np.asarray((matrix @ grouping(weight * negative)).sum(axis=0)).ravel().astype(np.int64)
+    )
+    with np.errstate(invalid="ignore"):
+        summary["avg_rating"] = (
+            (per_review.T @ np.where(rated, rating, 0.0))
+            / (per_review.T @ rated.astype(float))
+        )
+    return summary[summary["total_mentions"] > 0].reset_index(drop=True)
+
+
+def analyze_recurring_theme_concerns_sparse(
+    theme_matrix,
+    min_review_coverage: int = 3,
+    negative_ratio_threshold: float = 0.6,
+    max_avg_rating: float = 3.0,
+    top_k: int = 10
 ):
-    with open(flattened_keywords_json, "r", encoding="utf-8") as f:
-        flat_keywords = json.load(f)
+    """Same result as analyze_recurring_theme_concerns_json, from the matrix."""
+    return _rank_theme_concerns(
+        summarize_theme_groups(theme_matrix),
+        min_review_coverage, negative_ratio_threshold, max_avg_rating, top_k
+    )
 
-    phrase_keywords = [k for k in flat_keywords if " " in k["phrase"]]
-    token_keywords  = [k for k in flat_keywords if " " not in k["phrase"]]
 
-    df = pd.read_csv(input_csv)
-    reviews = df[review_text_column]
-    ratings = df[rating_column]
+# =========================
+# THEME ROWS FOR A REVIEW FRAME
+# =========================
+THEME_ROW_COLUMNS = ["review_id", "rating", "theme", "subtheme", "polarity", "phrase"]
+DEFAULT_SHARD_SIZE = 20_000
 
-    all_rows = []
 
-    for idx, (review, rating) in enumerate(zip(reviews, ratings)):
-        matches = extract_themes(review, phrase_keywords, token_keywords)
-        themes = build_theme_structure(matches)
-        flat_rows = flatten_extracted_themes(themes, idx, rating)
-        all_rows.extend(flat_rows)
+def _expand_ranges(starts, lengths):
+    """Concatenation of range(start, start + length) for each pair."""
+    ends = np.cumsum(lengths)
+    return np.repeat(starts - (ends - lengths), lengths) + np.arange(ends[-1] if len(ends) else 0)
 
-    themes_df = pd.DataFrame(all_rows)
-    themes_df.to_csv(output_csv, index=False)
 
+def corpus_token_keyword_hits(corpus, keyword_index):
+    """
+    The token pass of extract_themes for the whole corpus at once: per
+    review, the sorted ids of the single-word keywords among its tokens,
+    as CSR arrays (ptr, ids).
+    """
+    n_reviews = len(corpus["token_offsets"]) - 1
+    n_keywords = len(keyword_index["token_keywords"])
+    if not n_keywords:
+        return np.zeros(n_reviews + 1, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # vocab entry -> keyword ids; stopwords never match
+    token_index = keyword_index["token_index"]
+    vocab_hits = [
+        [] if token in STOPWORDS else token_index.get(token, [])
+        for token in corpus["vocab"]
+    ]
+    vocab_counts = np.fromiter(map(len, vocab_hits), dtype=np.int64, count=len(vocab_hits))
+    vocab_ids = np.fromiter(
+        (i for hits in vocab_hits for i in hits), dtype=np.int64, count=vocab_counts.sum()
+    )
+    vocab_starts = np.cumsum(vocab_counts) - vocab_counts
+
+    token_ids = corpus["token_ids"]
+    token_owner = np.repeat(np.arange(n_reviews), np.diff(corpus["token_offsets"]))
+    per_token = vocab_counts[token_ids]
+
+    owner = np.repeat(token_owner, per_token)
+    keyword = vocab_ids[_expand_ranges(vocab_starts[token_ids], per_token)]
+
+    # a token repeated in a review still counts once
+    owner, keyword = np.divmod(np.unique(owner * n_keywords + keyword), n_keywords)
+    ptr = np.concatenate([[0], np.cumsum(np.bincount(owner, minlength=n_reviews))])
+    return ptr, keyword
+
+
+def _theme_tuples(matches):
+    themes = build_theme_structure(matches)
+    return [
+        (theme, subtheme, polarity, phrase)
+        for theme, subthemes in themes.items()
+        for subtheme, polarities in subthemes.items()
+        for polarity, phrases in polarities.items()
+        for phrase in phrases
+    ]
+
+
+def _theme_rows(review_ids, ratings, clean_texts, token_ptr, token_hits, keyword_index):
+    """
+    Theme rows plus (reviews reused, distinct texts matched). Reviews that
+    are identical after normalization — repeated short texts, the canned
+    fills for empty ones — are folded with factorize, matched once, and
+    their hits fanned back out to every review carrying them, in order.
+    """
+    codes, uniques = pd.factorize(clean_texts)
+    _, first_row = np.unique(codes, return_index=True)
+
+    unique_hits = [
+        _theme_tuples(match_normalized_text(
+            text, keyword_index, token_hits[token_ptr[r]:token_ptr[r + 1]]
+        ))
+        for text, r in zip(uniques, first_row)
+    ]
+    reuse_stats = (len(codes) - len(uniques), len(uniques))
+
+    flat_hits = [hit for hits in unique_hits for hit in hits]
+    if not flat_hits:
+        return pd.DataFrame([], columns=THEME_ROW_COLUMNS), reuse_stats
+
+    # gather: output row -> (review position, hit in flat_hits)
+    hits_per_unique = np.fromiter(map(len, unique_hits), dtype=np.int64, count=len(unique_hits))
+    hits_per_review = hits_per_unique[codes]
+    review_pos = np.repeat(np.arange(len(codes)), hits_per_review)
+    hit_pos = _expand_ranges(
+        (np.cumsum(hits_per_unique) - hits_per_unique)[codes], hits_per_review
+    )
+
+    hit_table = np.empty((len(flat_hits), 4), dtype=object)
+    hit_table[:] = flat_hits
+    hit_table = hit_table[hit_pos]
+
+    return pd.DataFrame({
+        "review_id": np.asarray(review_ids)[review_pos],
+        "rating": np.asarray(ratings)[review_pos],
+        "theme": hit_table[:, 0],
+        "subtheme": hit_table[:, 1],
+        "polarity": hit_table[:, 2],
+        "phrase": hit_table[:, 3],
+    }), reuse_stats
+
+
+def _report_reuse(reused, matched):
+    total = reused + matched
+    if total:
+        print(f"✓ Theme matching: {matched:,} distinct texts for {total:,} reviews ({reused / total:.1%} reused)")
+
+
+# the compiled index reaches each worker once, not once per shard: either
+# as the cache file path (the worker loads it) or pickled with initargs
+_WORKER_KEYWORD_INDEX = None
+
+
+def _init_theme_worker(keyword_index):
+    global _WORKER_KEYWORD_INDEX
+    if isinstance(keyword_index, (str, os.PathLike)):
+        keyword_index = read_compiled_vocabulary(keyword_index)
+    _WORKER_KEYWORD_INDEX = keyword_index
+
+
+def _theme_rows_for_shard(shard):
+    return _theme_rows(*shard, _WORKER_KEYWORD_INDEX)
+
+
+def build_theme_rows(
+    df: pd.DataFrame,
+    keyword_index,
+    review_text_column: str = "review_text",
+    rating_column: str = "rating_overall",
+    review_id_column: str = "review_id",
+    n_workers: int = 1,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    corpus=None
+) -> pd.DataFrame:
+    """
+    One row per theme hit. review_id comes from `review_id_column` when
+    given (stable across runs), otherwise from the row position.
+    `keyword_index` is a build_keyword_index() result or the path of its
+    compiled cache file. `corpus` is the shared text corpus of `df`'s
+    review text; it is built here when not passed in.
+
+    With n_workers > 1 (None = all cores) the reviews are split into
+    contiguous shards and matched in a process pool; shards are merged
+    back in input order, so the result is identical to the serial path.
+    """
+    if corpus is None:
+        corpus = build_text_corpus(df[review_text_column])
+    if len(corpus["normalized"]) != len(df):
+        raise ValueError("Text corpus does not match the review frame")
+
+    index_source = keyword_index
+    if isinstance(keyword_index, (str, os.PathLike)):
+        keyword_index = read_compiled_vocabulary(keyword_index)
+
+    clean_texts = corpus["normalized"]
+    token_ptr, token_hits = corpus_token_keyword_hits(corpus, keyword_index)
+    ratings = df[rating_column].to_numpy()
+    review_ids = df[review_id_column].to_numpy() if review_id_column else np.arange(len(df))
+
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers == 1 or len(df) <= shard_size:
+        themes_df, reuse_stats = _theme_rows(
+            review_ids, ratings, clean_texts, token_ptr, token_hits, keyword_index
+        )
+        _report_reuse(*reuse_stats)
+        return themes_df
+
+    # at least one shard per worker so small corpora still spread out
+    shard_size = min(shard_size, -(-len(df) // n_workers))
+    shards = [
+        (
+            review_ids[i:j], ratings[i:j], clean_texts[i:j],
+            token_ptr[i:j + 1] - token_ptr[i], token_hits[token_ptr[i]:token_ptr[j]]
+        )
+        for i, j in (
+            (i, min(i + shard_size, len(df))) for i in range(0, len(df), shard_size)
+        )
+    ]
+
+    with ProcessPoolExecutor(
+        max_workers=min(n_workers, len(shards)),
+        initializer=_init_theme_worker,
+        initargs=(index_source,)
+    ) as pool:
+        results = list(pool.map(_theme_rows_for_shard, shards))
+
+    _report_reuse(
+        sum(reused for _, (reused, _) in results),
+        sum(matched for _, (_, matched) in results)
+    )
+
+    # empty shards carry object columns and would widen the dtypes
+    parts = [r[0] for r in results if len(r[0])] or [results[0][0]]
+    return pd.concat(parts, ignore_index=True)
+
+
+def summarize_theme_rows(themes_df: pd.DataFrame, total_reviews: int):
     # 🔍 JSON insight generation
     concerns_json = analyze_recurring_theme_concerns_json(themes_df)
 
-    result = {
+    return {
         "summary": {
-            "total_reviews_processed": len(df),
+            "total_reviews_processed": total_reviews,
             "total_theme_mentions": len(themes_df),
         },
         "top_genuine_concerns": concerns_json,
         # "raw_theme_rows": themes_df.to_dict(orient="records")
     }
-    
-    return result
+
+
+# =========================
+# 🚀 MAIN REUSABLE FUNCTION
+# =========================
+def run_theme_extraction(
+    input_csv: str,
+    flattened_keywords_json: str,
+    output_csv: str = None,
+    review_text_column: str = "review_text",
+    rating_column: str = "rating_overall",
+    review_id_column: str = "review_id",
+    n_workers: int = 1,
+    matrix_output_path: str = None,
+    corpus=None
+):
+    """
+    input_csv may also be an in-memory reviews DataFrame; with
+    output_csv=None the theme rows are not written to disk.
+    """
+    keyword_index = compiled_vocabulary_source(flattened_keywords_json, build_keyword_index)
+
+    columns = [review_text_column, rating_column]
+    if review_id_column:
+        columns.insert(0, review_id_column)
+    df = as_frame(input_csv, columns=columns)
+
+    themes_df = build_theme_rows(
+        df, keyword_index, review_text_column, rating_column,
+        review_id_column, n_workers=n_workers, corpus=corpus
+    )
+    if output_csv:
+        write_frame(themes_df, output_csv)
+    if matrix_output_path:
+        write_theme_matrix(build_theme_matrix(themes_df), matrix_output_path)
+
+    return summarize_theme_rows(themes_df, len(df))
 
 
 
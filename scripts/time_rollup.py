@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+
+from .columnar_io import as_frame
+from .streaming_stats import histogram_medians
+
+# =========================
+# TIME ROLLUP CUBE
+# =========================
+# One row per day × city × cuisine × restaurant with
+#   reviews       number of reviews
+#   rating_count  reviews with a rating
+#   rating_sum    sum of those ratings
+#   likes_count   reviews with a like count
+#   likes_sum     total likes
+# Daily, weekly, monthly and per-dimension series are all derived from
+# it, and it is persisted with the run so the report can query
+# arbitrary windows without rescanning the reviews.
+#
+# Medians are not sums, so they need a rating histogram. That is an
+# opt-in secondary table (build_rating_histogram): the same key plus an
+# integer rating bucket, one row per bucket present.
+
+ROLLUP_DIMENSIONS = ["city", "primary_cuisine", "restaurant_name"]
+ROLLUP_FILE = "time_rollup.parquet"
+RATING_HISTOGRAM_FILE = "rating_histogram.parquet"
+ROLLUP_MEASURES = ["reviews", "rating_count", "rating_sum", "likes_count", "likes_sum"]
+
+
+def _rollup_frame(df):
+    """day + dimensions + float rating / likes, reviews without a timestamp dropped."""
+    created_at = df["created_at"]
+    if not pd.api.types.is_datetime64_any_dtype(created_at):
+        created_at = pd.to_datetime(created_at, errors="coerce")
+
+    # reviews without a timestamp have no place on the time axis
+    keep = created_at.notna()
+    return pd.DataFrame({
+        "day": created_at.dt.normalize(),
+        **{dim: df[dim] for dim in ROLLUP_DIMENSIONS},
+        "rating": pd.to_numeric(df["rating_overall"], errors="coerce").astype("float64"),
+        "likes": pd.to_numeric(df["like_count"], errors="coerce").astype("float64"),
+    })[keep]
+
+
+def build_time_rollup(df):
+    frame = _rollup_frame(df)
+    return (
+        frame.groupby(["day", *ROLLUP_DIMENSIONS], observed=True, dropna=False)
+        .agg(
+            reviews=("rating", "size"),
+            rating_count=("rating", "count"),
+            rating_sum=("rating", "sum"),
+            likes_count=("likes", "count"),
+            likes_sum=("likes", "sum"),
+        )
+        .reset_index()
+    )
+
+
+def build_rating_histogram(df):
+    """
+    Reviews per day × dimensions × rating bucket, for medians. Bucket b
+    holds ratings in [b, b + 1), so medians are exact for whole-star
+    ratings and bucket lower edges otherwise.
+    """
+    frame = _rollup_frame(df)
+    frame = frame[frame["rating"].notna()].assign(rating_bucket=lambda f: np.floor(f["rating"]))
+    return (
+        frame.groupby(["day", *ROLLUP_DIMENSIONS, "rating_bucket"], observed=True, dropna=False)
+        .size()
+        .rename("reviews")
+        .reset_index()
+    )
+
+
+def merge_time_rollups(a, b):
+    """
+    One cube (or rating histogram) from two, e.g. built over separate
+    chunks of the reviews: the measures are plain sums, so cells with the
+    same key are added.
+    """
+    measures = [column for column in a.columns if column in ROLLUP_MEASURES]
+    keys = [column for column in a.columns if column not in ROLLUP_MEASURES]
+    return (
+        pd.concat([a, b], ignore_index=True)
+        .groupby(keys, observed=True, dropna=False)[measures]
+        .sum()
+        .reset_index()
+    )
+
+
+def _filter_rollup(table, start=None, end=None, filters=None):
+    mask = pd.Series(True, index=table.index)
+    if start is not None:
+        mask &= table["day"] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= table["day"] <= pd.Timestamp(end)
+    for dim, values in (filters or {}).items():
+        values = [values] if np.isscalar(values) else values
+        mask &= table[dim].isin(values)
+    return table[mask]
+
+
+def rollup_series(cube, freq="D", by=None, start=None, end=None, filters=None, histogram=None):
+    """
+    mean_rating / rating_count / mean_likes per period (pandas offset
+    alias: "D", "W", "ME", ...) and per `by` dimensions, plus
+    median_rating when the rating histogram is given.
+
+    start / end bound the days (inclusive); filters is {dimension: value
+    or list of values}. Without `by` every period in range is present,
+    empty ones as NaN / 0, the same as resample(freq).
+    """
+    by = [by] if isinstance(by, str) else list(by or [])
+    keys = [pd.Grouper(key="period", freq=freq), *by]
+
+    cube = _filter_rollup(cube, start, end, filters).rename(columns={"day": "period"})
+    sums = cube.groupby(keys, observed=True)[ROLLUP_MEASURES].sum()
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        series = pd.DataFrame({
+            "mean_rating": sums["rating_sum"] / sums["rating_count"].where(sums["rating_count"] > 0),
+            "rating_count": sums["rating_count"].astype("int64"),
+            "mean_likes": sums["likes_sum"] / sums["likes_count"].where(sums["likes_count"] > 0),
+        })
+
+    if histogram is not None:
+        histogram = _filter_rollup(histogram, start, end, filters).rename(columns={"day": "period"})
+        hist = histogram.groupby([*keys, "rating_bucket"], observed=True)["reviews"].sum()
+        medians = histogram_medians(hist[hist > 0])
+        series.insert(1, "median_rating", medians.reindex(series.index).to_numpy())
+
+    if not by and len(series):
+        series = series.asfreq(freq)
+        series["rating_count"] = series["rating_count"].fillna(0).astype("int64")
+    return series
+
+
+def load_time_rollup(source):
+    """Cube (or rating histogram) from an in-memory frame or a persisted file."""
+    return as_frame(source)
+
+
+def query_time_rollup(source, freq="D", by=None, start=None, end=None, filters=None, histogram=None):
+    """
+    rollup_series over a persisted cube (and, for medians, a persisted
+    rating histogram), as JSON-ready records.
+    """
+    if histogram is not None:
+        histogram = load_time_rollup(histogram)
+    series = rollup_series(
+        load_time_rollup(source), freq, by, start, end, filters, histogram
+    ).reset_index()
+    series["period"] = series["period"].astype(str)
+    return series.astype(object).where(series.notna(), None).to_dict("records")
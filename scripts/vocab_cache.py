@@ -0,0 +1,103 @@
+import os
+import sys
+import json
+import pickle
+import hashlib
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+# =========================
+# COMPILED VOCABULARY CACHE
+# =========================
+# Keyword JSON files are compiled into matcher structures (automata,
+# token indexes, ...) once and pickled next to the scripts. The file name
+# carries a hash of the JSON bytes, the builder's name and module source,
+# phrase_matcher.py and VOCAB_CACHE_VERSION, so editing the vocabulary or
+# the code that builds it invalidates the cache while unrelated modules
+# do not. Bump VOCAB_CACHE_VERSION when a builder's output changes
+# through code outside those files.
+#
+# The directory can be moved with VOCAB_CACHE_DIR (e.g. for read-only
+# installs); when it cannot be written at all, vocabularies are compiled
+# in memory on every run instead.
+
+BASE_DIR = Path(__file__).resolve().parent
+VOCAB_CACHE_DIR = Path(os.getenv("VOCAB_CACHE_DIR", BASE_DIR / ".vocab_cache"))
+VOCAB_CACHE_VERSION = 1
+# matcher code every compiled vocabulary is built from
+SHARED_BUILDER_SOURCES = [BASE_DIR / "phrase_matcher.py"]
+
+
+def builder_source_files(module_name):
+    """Source files whose edits invalidate a builder's compiled output."""
+    return [Path(sys.modules[module_name].__file__), *SHARED_BUILDER_SOURCES]
+
+
+@lru_cache(maxsize=None)
+def _builder_source_digest(module_name):
+    digest = hashlib.sha256(f"v{VOCAB_CACHE_VERSION}".encode())
+    for path in builder_source_files(module_name):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def compiled_vocabulary_path(json_path, builder, cache_dir=None):
+    """
+    Path of the compiled form of `json_path`, building it with
+    builder(parsed_json) first if no up-to-date copy exists.
+    """
+    raw = Path(json_path).read_bytes()
+    digest = hashlib.sha256(raw)
+    digest.update(f"{builder.__module__}.{builder.__qualname__}".encode())
+    digest.update(_builder_source_digest(builder.__module__).encode())
+
+    cache_dir = Path(cache_dir or VOCAB_CACHE_DIR)
+    path = cache_dir / f"{Path(json_path).stem}.{builder.__name__}.{digest.hexdigest()[:16]}.pkl"
+    if path.exists():
+        return path
+
+    compiled = builder(json.loads(raw))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # write then rename, so concurrent runs never read a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    for stale in cache_dir.glob(f"{Path(json_path).stem}.{builder.__name__}.*.pkl"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    return path
+
+
+def compiled_vocabulary_source(json_path, builder, cache_dir=None):
+    """
+    compiled_vocabulary_path, or the compiled vocabulary itself when the
+    cache directory cannot be written. Matchers that take either (e.g.
+    build_theme_rows) can be handed the result directly.
+    """
+    try:
+        return compiled_vocabulary_path(json_path, builder, cache_dir)
+    except OSError as e:
+        print(f"Vocabulary cache unavailable ({e}); compiling {Path(json_path).name} in memory")
+        with open(json_path, "r", encoding="utf-8") as f:
+            return builder(json.load(f))
+
+
+def read_compiled_vocabulary(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def load_compiled_vocabulary(json_path, builder, cache_dir=None):
+    source = compiled_vocabulary_source(json_path, builder, cache_dir)
+    if isinstance(source, Path):
+        return read_compiled_vocabulary(source)
+    return source
@@ -0,0 +1,35 @@
+import pandas as pd
+
+from scripts.anomaly_engine import ANOMALY_RULES, detect_anomalies
+
+
+def _reviews():
+    return pd.DataFrame({
+        "reviewer_name": ["a", "b", "c", "d"],
+        "rating_overall": pd.array([1.0, 5.0, 1.0, None], dtype="Float64"),
+        "like_count": pd.array([None, 2, 40, 1], dtype="Int64"),
+        "restaurant_name": ["x", "x", "y", "y"],
+        "restaurant_review_count": [30, 30, 30, 30],
+        "restaurant_overall_rating": [4.5, 4.5, 4.5, 4.5],
+    })
+
+
+def test_page_keeps_missing_values_as_none():
+    low_rating = {"name": "low_rating", "mask": lambda df, thresholds: df["rating_overall"] <= 1, "standalone": True}
+    missing_rating = {"name": "missing_rating", "mask": lambda df, thresholds: df["rating_overall"].isna(), "standalone": True}
+
+    result = detect_anomalies(_reviews(), rules=[low_rating, missing_rating], page=0)
+
+    assert result["anomaly_count"] == 3
+    assert [(r["reviewer_name"], r["rating_overall"], r["like_count"]) for r in result["anomalies"]] == [
+        ("a", 1.0, None),
+        ("c", 1.0, 40),
+        ("d", None, 1),
+    ]
+
+
+def test_missing_like_count_never_raises_a_flag():
+    result = detect_anomalies(_reviews(), rules=ANOMALY_RULES, page=0)
+
+    assert "a" not in [r["reviewer_name"] for r in result["anomalies"]]
+    assert result["flag_counts"]["viral_engagement"] == 1
@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import load_flat_keywords, synthetic_reviews
+from scripts.runnner import THEME_KEYWORDS_JSON
+from scripts.theme_extraction import build_keyword_index, build_theme_rows
+from scripts.vocab_cache import compiled_vocabulary_path
+
+
+@pytest.fixture(scope="module")
+def reviews():
+    df = synthetic_reviews(2_000, seed=1)
+    # duplicates and empty text cross shard boundaries
+    return pd.concat([df, df.head(300), df.head(5).assign(review_text="")], ignore_index=True)
+
+
+@pytest.fixture(scope="module")
+def keyword_index():
+    return build_keyword_index(load_flat_keywords())
+
+
+@pytest.fixture(scope="module")
+def serial(reviews, keyword_index):
+    return build_theme_rows(reviews, keyword_index)
+
+
+@pytest.mark.parametrize("n_workers", [2, 3, 4])
+def test_sharded_matches_serial(reviews, keyword_index, serial, n_workers):
+    sharded = build_theme_rows(reviews, keyword_index, n_workers=n_workers, shard_size=257)
+    pd.testing.assert_frame_equal(sharded, serial)
+
+
+@pytest.mark.parametrize("n_workers", [1, 3])
+def test_keyword_index_path_matches_dict(reviews, serial, tmp_path, n_workers):
+    path = compiled_vocabulary_path(THEME_KEYWORDS_JSON, build_keyword_index, cache_dir=tmp_path)
+    from_path = build_theme_rows(reviews, path, n_workers=n_workers, shard_size=500)
+    pd.testing.assert_frame_equal(from_path, serial)
+
+
+def test_positional_review_ids(reviews, keyword_index):
+    serial = build_theme_rows(reviews, keyword_index, review_id_column=None)
+    sharded = build_theme_rows(reviews, keyword_index, review_id_column=None, n_workers=2, shard_size=400)
+    pd.testing.assert_frame_equal(sharded, serial)
+    assert serial["review_id"].max() < len(reviews)
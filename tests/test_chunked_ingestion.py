@@ -0,0 +1,71 @@
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.columnar_io import read_frame
+from scripts.excel_ingestion import (
+    iter_standardized_chunks,
+    standardize_restaurant_reviews,
+    standardize_restaurant_reviews_chunked,
+)
+
+
+def raw_reviews(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "created_at": (pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 5000, n), unit="h"))
+        .strftime("%Y-%m-%d %H:%M"),
+        "reviewer_name": rng.choice(["ann", "bo", "cy"], n),
+        "review_text": rng.choice(["cold food", "great service", "slow", "ok"], n),
+        "rating_overall": rng.choice([1, 2, 3, 4, 5, 4.5, np.nan], n),
+        "like_count": rng.integers(0, 50, n),
+        "restaurant_name": rng.choice(["r1", "r2", "r3"], n),
+        "city": rng.choice(["pune", "goa"], n),
+        "primary_cuisine": rng.choice(["thai", "cafe"], n),
+    })
+
+
+def as_values(df):
+    return df.astype(object).where(df.notna(), None).reset_index(drop=True)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "reviews.csv"
+    raw_reviews(1_000).to_csv(path, index=False)
+    return path
+
+
+def test_chunked_matches_in_memory(csv_path, tmp_path):
+    out = tmp_path / "out" / "standardized.parquet"
+    out.parent.mkdir()
+
+    rows = standardize_restaurant_reviews_chunked(csv_path, out, chunksize=128)
+
+    expected = standardize_restaurant_reviews(csv_path)
+    result = read_frame(out)
+    assert rows == len(expected)
+    pd.testing.assert_frame_equal(as_values(result), as_values(expected[result.columns]))
+    # no spill or temporary copy next to the output
+    assert [p.name for p in out.parent.iterdir()] == [out.name]
+
+
+def test_zip_members_are_split_by_chunksize(tmp_path):
+    raw = raw_reviews(600, seed=1)
+    archive = tmp_path / "outlets.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("a.csv", raw.iloc[:400].to_csv(index=False))
+        zf.writestr("b.csv", raw.iloc[400:].to_csv(index=False))
+
+    sizes = [len(chunk) for chunk in iter_standardized_chunks(archive, chunksize=150, max_workers=1)]
+    # 400 + 200 rows -> 150, 150, 100 | 150, 50 before unrated rows are dropped
+    assert max(sizes) <= 150 and len(sizes) == 5
+
+    out = tmp_path / "standardized.parquet"
+    rows = standardize_restaurant_reviews_chunked(archive, out, chunksize=150, max_workers=1)
+
+    expected = standardize_restaurant_reviews(archive)
+    assert rows == len(expected)
+    assert list(read_frame(out)["review_id"]) == list(expected["review_id"])
@@ -0,0 +1,29 @@
+import pandas as pd
+
+from benchmarks.bench_clean_rows import clean_rows_rowwise, synthetic_reviews
+from scripts.excel_ingestion import clean_rows_based_on_rating
+
+
+def test_matches_rowwise_backfill():
+    df = synthetic_reviews(5_000)
+
+    expected = clean_rows_rowwise(df.copy())
+    result = clean_rows_based_on_rating(df.copy())
+
+    pd.testing.assert_index_equal(result.index, expected.index)
+    pd.testing.assert_series_equal(
+        result["review_text"].astype(object),
+        expected["review_text"].astype(object),
+    )
+    pd.testing.assert_series_equal(result["rating_overall"], expected["rating_overall"])
+
+
+def test_fills_by_truncated_rating():
+    df = pd.DataFrame({
+        "review_text": ["", None, "  ", "kept", ""],
+        "rating_overall": [4.7, 1, 9, 2, None],
+    })
+
+    result = clean_rows_based_on_rating(df)
+
+    assert list(result["review_text"]) == ["good", "very bad", "average", "kept"]
@@ -0,0 +1,60 @@
+import pandas as pd
+
+from scripts.excel_ingestion import infer_datetime_formats, parse_datetime_column
+
+DAY_FIRST = pd.Series(["05/06/2024 10:00", "25/06/2024 11:00", "13/07/2024 09:30"], name="created_at")
+AMBIGUOUS = pd.Series(["05/06/2024 10:00", "03/04/2024 11:00", "01/02/2024 09:30"], name="created_at")
+
+
+def test_uploads_do_not_share_inferred_formats():
+    fresh, _ = parse_datetime_column(AMBIGUOUS.copy())
+
+    parse_datetime_column(DAY_FIRST.copy())
+    after_day_first, _ = parse_datetime_column(AMBIGUOUS.copy())
+
+    pd.testing.assert_series_equal(after_day_first, fresh)
+
+
+def test_cached_formats_are_revalidated():
+    cache = {}
+    month_first = infer_datetime_formats(AMBIGUOUS, cache=cache)
+    assert len(cache) == 1
+
+    # same value shapes, but this chunk only parses day-first
+    day_first = infer_datetime_formats(DAY_FIRST, cache=cache)
+
+    assert day_first != month_first
+    parsed, report = parse_datetime_column(DAY_FIRST.copy(), format_cache=cache)
+    assert report["fallback_parsed"] == 0 and report["unparsed"] == 0
+    assert parsed.iloc[1] == pd.Timestamp("2024-06-25 11:00", tz="UTC")
+
+
+def test_chunks_reuse_cached_formats():
+    cache = {}
+    formats = infer_datetime_formats(DAY_FIRST, cache=cache)
+
+    assert infer_datetime_formats(DAY_FIRST.iloc[::-1], cache=cache) is formats
+
+
+def test_chunked_parse_report_sums_chunks(tmp_path):
+    from scripts.excel_ingestion import standardize_restaurant_reviews, standardize_restaurant_reviews_chunked
+
+    dates = ["2024-01-05 10:00", "not a date", None, "2024-02-11 09:15"] * 25
+    path = tmp_path / "reviews.csv"
+    pd.DataFrame({
+        "created_at": dates,
+        "reviewer_name": "ann",
+        "review_text": "cold food",
+        "rating_overall": 3,
+        "like_count": 1,
+        "restaurant_name": "r1",
+        "city": "pune",
+        "primary_cuisine": "thai",
+    }).to_csv(path, index=False)
+
+    report = {}
+    standardize_restaurant_reviews_chunked(path, tmp_path / "out.parquet", chunksize=30, parse_report=report)
+
+    expected = standardize_restaurant_reviews(path).attrs["created_at_parse_report"]
+    assert report == expected
+    assert report["unparsed"] == 25 and report["missing"] == 25
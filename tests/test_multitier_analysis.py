@@ -0,0 +1,27 @@
+import json
+from pathlib import Path
+
+from scripts import multilayer_verbatim_analysis as multitier
+from scripts import vocab_cache
+
+FIXTURES = Path(__file__).parent / "fixtures" / "multitier"
+
+
+def test_matches_row_by_row_baseline(tmp_path, monkeypatch):
+    # expected_output.json was produced by the original per-row
+    # (iterrows / substring scan) implementation on the same inputs. The
+    # fixture has ties at every ranking step, dishes nested inside other
+    # dishes and "paneer tikka" listed under two ontology groups.
+    monkeypatch.setattr(multitier, "RULE_KEYWORDS_JSON", FIXTURES / "rule_keywords.json")
+    monkeypatch.setattr(multitier, "FOOD_ONTOLOGY_JSON", FIXTURES / "food_domain_ontology.json")
+    monkeypatch.setattr(vocab_cache, "VOCAB_CACHE_DIR", tmp_path)
+
+    result = multitier.run_full_multitier_analysis(
+        reviews=FIXTURES / "reviews.csv",
+        themes=FIXTURES / "themes.csv",
+        output_path=None,
+    )
+
+    expected = json.loads((FIXTURES / "expected_output.json").read_text(encoding="utf-8"))
+    # compare through JSON so dict order is checked too
+    assert json.dumps(result, indent=2) == json.dumps(expected, indent=2)
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from scripts import quantitative_analysis
+from scripts import streaming_stats
+from scripts.columnar_io import write_frame
+from scripts.quantitative_analysis import STATISTICAL_OUTLIER_KEYS, quantitative_analysis_runner
+
+CHUNKSIZE = 400
+
+
+@pytest.fixture(scope="module")
+def reviews():
+    # fewer rows than the sketch holds, so streamed quantiles are exact
+    rng = np.random.default_rng(3)
+    n = 1_500
+    restaurants = np.array([f"r{i}" for i in range(40)])
+    df = pd.DataFrame({
+        "review_id": [f"id{i}" for i in range(n)],
+        "created_at": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 90 * 24, n), unit="h"),
+        "reviewer_name": rng.choice([f"u{i}" for i in range(300)], n),
+        "rating_overall": rng.integers(1, 6, n).astype("float64"),
+        "like_count": np.where(rng.random(n) < 0.3, 0, rng.pareto(1.5, n) * 10).astype("int64"),
+        "restaurant_name": rng.choice(restaurants, n),
+        "city": rng.choice(["pune", "delhi", "goa"], n),
+        "primary_cuisine": rng.choice(["thai", "north indian", "cafe"], n),
+        "review_text": "text",
+    })
+    agg = df.groupby("restaurant_name")["rating_overall"].agg(["count", "mean"])
+    df["restaurant_review_count"] = df["restaurant_name"].map(agg["count"]).astype("int32")
+    df["restaurant_overall_rating"] = df["restaurant_name"].map(agg["mean"]).round(2)
+    # a restaurant that trips the rating-gap rule, so anomalies are counted
+    df.loc[:24, "restaurant_name"] = "outlier"
+    df.loc[:24, "restaurant_review_count"] = 25
+    df.loc[:24, "restaurant_overall_rating"] = 4.9
+    df.loc[:4, "rating_overall"] = 1.0
+    return df
+
+
+@pytest.fixture(scope="module")
+def exact(reviews):
+    return quantitative_analysis_runner(reviews.copy(), output_dir=None, rating_histogram=True)
+
+
+def assert_streamed_matches(streamed, exact):
+    for stage in ["stage_1_descriptive_statistics", "stage_2_statistical_tests", "stage_4_time_series"]:
+        assert_nested_approx(streamed[stage], exact[stage])
+
+    for key in STATISTICAL_OUTLIER_KEYS:
+        result = dict(streamed["stage_3_outlier_detection"][key])
+        assert result.pop("approximate") is False
+        assert result == pytest.approx(exact["stage_3_outlier_detection"][key], rel=1e-9)
+    for key in ["anomaly_count", "anomaly_percentage", "anomaly_flag_counts"]:
+        assert streamed["stage_3_outlier_detection"][key] == exact["stage_3_outlier_detection"][key]
+    assert exact["stage_3_outlier_detection"]["anomaly_count"] > 0
+
+    for key in ["total_reviews", "date_range_start", "date_range_end"]:
+        assert streamed["metadata"][key] == exact["metadata"][key]
+    assert streamed["metadata"]["streaming_approximate_fields"]
+
+
+def assert_nested_approx(a, b):
+    if isinstance(b, dict):
+        assert list(a) == list(b)
+        for key in b:
+            assert_nested_approx(a[key], b[key])
+    elif isinstance(b, list):
+        assert len(a) == len(b)
+        for x, y in zip(a, b):
+            assert_nested_approx(x, y)
+    elif isinstance(b, (float, np.floating)):
+        assert a == pytest.approx(b, rel=1e-9, nan_ok=True)
+    else:
+        assert a == b
+
+
+def test_streaming_from_frame(reviews, exact):
+    streamed = quantitative_analysis_runner(
+        reviews.copy(), output_dir=None, streaming=True, chunksize=CHUNKSIZE, rating_histogram=True
+    )
+    assert_streamed_matches(streamed, exact)
+
+
+def test_streaming_from_file(reviews, exact, tmp_path):
+    path = tmp_path / "reviews.parquet"
+    write_frame(reviews, path)
+    streamed = quantitative_analysis_runner(
+        path, output_dir=None, streaming=True, chunksize=CHUNKSIZE, rating_histogram=True
+    )
+    assert_streamed_matches(streamed, exact)
+
+
+def test_streaming_row_groups_in_parallel(reviews, exact, tmp_path):
+    path = tmp_path / "reviews.parquet"
+    pq.write_table(pa.Table.from_pandas(reviews, preserve_index=False), path, row_group_size=CHUNKSIZE)
+    streamed = quantitative_analysis_runner(
+        path, output_dir=None, streaming=True, chunksize=CHUNKSIZE, max_workers=2, rating_histogram=True
+    )
+    assert_streamed_matches(streamed, exact)
+
+
+def test_streaming_never_builds_the_whole_frame(reviews, tmp_path, monkeypatch):
+    path = tmp_path / "reviews.csv"
+    write_frame(reviews, path)
+
+    def whole_frame(*args, **kwargs):
+        raise AssertionError("streaming mode loaded the whole frame")
+
+    monkeypatch.setattr(quantitative_analysis, "as_frame", whole_frame)
+    monkeypatch.setattr(quantitative_analysis.pd, "read_csv", _chunked_only(pd.read_csv))
+
+    seen = []
+    iter_chunks = streaming_stats.iter_frame_chunks
+
+    def recording_chunks(file_path, chunksize, columns=None):
+        for chunk in iter_chunks(file_path, chunksize, columns):
+            seen.append((len(chunk), list(chunk.columns)))
+            yield chunk
+
+    monkeypatch.setattr(streaming_stats, "iter_frame_chunks", recording_chunks)
+
+    quantitative_analysis_runner(path, output_dir=None, streaming=True, chunksize=CHUNKSIZE)
+
+    assert seen and max(rows for rows, _ in seen) <= CHUNKSIZE
+    # two passes: stage inputs, then anomalies
+    assert sum(rows for rows, _ in seen) == 2 * len(reviews)
+    assert all("review_text" not in columns for _, columns in seen)
+
+
+def _chunked_only(read_csv):
+    def guarded(*args, **kwargs):
+        if not kwargs.get("chunksize"):
+            raise AssertionError("streaming mode read the whole file")
+        return read_csv(*args, **kwargs)
+    return guarded
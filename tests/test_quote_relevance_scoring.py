@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from scripts.quote_relevance_scoring import generate_top_relevant_unique_quotes
+
+MULTITIER = {
+    "tier_1": {"issue_distribution": [{"domain": "FOOD", "percentage": 50.0}]},
+    "tier_2": {"quality_dimension_distribution": [{"concept": "taste", "review_count": 4}]},
+    "tier_3": {"top_root_causes": [{"phrase": "cold food", "count": 3}]},
+}
+
+
+def themes(rows):
+    return pd.DataFrame(rows, columns=["review_id", "rating", "theme", "subtheme", "phrase"])
+
+
+def test_rated_quote_wins_tie_over_unrated():
+    quotes = generate_top_relevant_unique_quotes(themes([
+        (1, np.nan, "food", "taste", "cold food"),
+        (2, 3.0, "food", "taste", "cold food"),
+    ]), MULTITIER)
+
+    assert [q["review_id"] for q in quotes] == ["2"]
+
+
+def test_unrated_quote_kept_when_signal_has_no_rating():
+    quotes = generate_top_relevant_unique_quotes(themes([
+        (1, np.nan, "food", "taste", "cold food"),
+        (2, np.nan, "food", "taste", "cold food"),
+        (3, 1.0, "food", "taste", "burnt"),
+    ]), MULTITIER)
+
+    assert sorted(q["review_id"] for q in quotes) == ["1", "3"]
+
+
+def test_lowest_rating_then_input_order_among_equal_scores():
+    quotes = generate_top_relevant_unique_quotes(themes([
+        (1, 2.0, "food", "taste", "cold food"),
+        (2, 1.0, "food", "taste", "cold food"),
+        (3, 1.0, "food", "taste", "cold food"),
+    ]), MULTITIER)
+
+    # 3 - rating differs, so the lower rating also scores higher
+    assert [q["review_id"] for q in quotes] == ["2"]
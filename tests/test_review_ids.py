@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+from scripts.columnar_io import read_frame
+from scripts.excel_ingestion import (
+    compute_review_ids,
+    new_review_id_state,
+    standardize_restaurant_reviews,
+    standardize_restaurant_reviews_chunked,
+)
+from scripts.incremental_ingestion import ingest_incremental, load_review_store
+
+
+def uploads(tmp_path):
+    rng = np.random.default_rng(7)
+    n = 300
+    df = pd.DataFrame({
+        "created_at": (pd.Timestamp("2024-03-01") + pd.to_timedelta(rng.integers(0, 2000, n), unit="h"))
+        .strftime("%Y-%m-%d %H:%M"),
+        "reviewer_name": rng.choice(["ann", "bo", "cy"], n),
+        "review_text": rng.choice(["cold food", "great service", "slow", "ok"], n),
+        "rating_overall": rng.integers(1, 6, n),
+        "like_count": rng.integers(0, 50, n),
+        "restaurant_name": rng.choice(["r1", "r2"], n),
+        "city": "pune",
+        "primary_cuisine": "thai",
+    })
+    # exact duplicates, spread over the file and repeated three times
+    df = pd.concat([df, df.iloc[:40], df.iloc[250:260], df.iloc[:5]], ignore_index=True)
+    path = tmp_path / "reviews.csv"
+    df.to_csv(path, index=False)
+    return df, path
+
+
+def test_duplicate_rows_get_distinct_ids(tmp_path):
+    raw, path = uploads(tmp_path)
+
+    reviews = standardize_restaurant_reviews(path)
+
+    assert len(reviews) == len(raw)
+    assert reviews["review_id"].is_unique
+    # the first copy keeps the plain content hash, so re-ingestion is stable
+    assert list(standardize_restaurant_reviews(path)["review_id"]) == list(reviews["review_id"])
+
+
+def test_chunked_ids_count_occurrences_across_chunks(tmp_path):
+    _, path = uploads(tmp_path)
+    out = tmp_path / "standardized.parquet"
+
+    standardize_restaurant_reviews_chunked(path, out, chunksize=64)
+
+    assert list(read_frame(out)["review_id"]) == list(standardize_restaurant_reviews(path)["review_id"])
+
+
+def test_id_state_matches_single_frame():
+    df = pd.DataFrame({
+        "created_at": pd.to_datetime(["2024-01-01"] * 6, utc=True),
+        "reviewer_name": ["a", "a", "b", "a", "b", "a"],
+        "review_text": "x",
+        "rating_overall": 4.0,
+        "restaurant_name": "r",
+        "city": "c",
+        "primary_cuisine": "p",
+    })
+    whole = compute_review_ids(df)
+
+    state = new_review_id_state()
+    parts = np.concatenate([compute_review_ids(df.iloc[i:i + 2], state) for i in range(0, 6, 2)])
+
+    assert list(parts) == list(whole)
+    assert len(set(whole)) == 6
+
+
+def test_incremental_keeps_duplicates_and_dedupes_reuploads(tmp_path):
+    raw, path = uploads(tmp_path)
+    state_dir = tmp_path / "state"
+
+    first = ingest_incremental(path, state_dir)
+    again = ingest_incremental(path, state_dir)
+
+    assert len(first) == len(raw)
+    assert len(again) == 0
+    store = load_review_store(state_dir)
+    assert sorted(store["review_id"]) == sorted(standardize_restaurant_reviews(path)["review_id"])
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.time_rollup import (
+    ROLLUP_DIMENSIONS,
+    build_rating_histogram,
+    build_time_rollup,
+    merge_time_rollups,
+    rollup_series,
+)
+
+
+@pytest.fixture(scope="module")
+def reviews():
+    rng = np.random.default_rng(7)
+    n = 3_000
+    df = pd.DataFrame({
+        "created_at": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 60 * 24, n), unit="h"),
+        "city": rng.choice(["pune", "delhi", "goa"], n),
+        "primary_cuisine": rng.choice(["thai", "cafe"], n),
+        "restaurant_name": rng.choice([f"r{i}" for i in range(5)], n),
+        "rating_overall": rng.integers(1, 6, n).astype("float64"),
+        "like_count": pd.array(rng.integers(0, 20, n), dtype="Int64"),
+    })
+    df.loc[::50, "rating_overall"] = np.nan
+    df.loc[::70, "like_count"] = pd.NA
+    df.loc[::90, "created_at"] = pd.NaT
+    return df
+
+
+def test_cube_has_one_row_per_day_and_dimensions(reviews):
+    cube = build_time_rollup(reviews)
+
+    cells = reviews.dropna(subset=["created_at"]).assign(day=lambda d: d["created_at"].dt.normalize())
+    assert len(cube) == len(cells.groupby(["day", *ROLLUP_DIMENSIONS]))
+    assert "rating_overall" not in cube.columns
+    assert cube["reviews"].sum() == len(cells)
+
+
+def test_series_match_resample(reviews):
+    cube = build_time_rollup(reviews)
+    histogram = build_rating_histogram(reviews)
+    ts = reviews.set_index("created_at").sort_index()
+
+    for freq in ["D", "W", "ME"]:
+        series = rollup_series(cube, freq, histogram=histogram)
+        expected = ts.resample(freq).agg(
+            mean_rating=("rating_overall", "mean"),
+            median_rating=("rating_overall", "median"),
+            rating_count=("rating_overall", "count"),
+        )
+        expected["mean_likes"] = ts["like_count"].astype("float64").resample(freq).mean()
+        expected.index.name = "period"
+
+        pd.testing.assert_frame_equal(series, expected[series.columns], check_freq=False)
+
+
+def test_medians_only_with_histogram(reviews):
+    series = rollup_series(build_time_rollup(reviews), "ME", by="city")
+    assert list(series.columns) == ["mean_rating", "rating_count", "mean_likes"]
+
+
+def test_merged_chunks_equal_whole_cube(reviews):
+    for build in [build_time_rollup, build_rating_histogram]:
+        merged = merge_time_rollups(build(reviews.iloc[:1_000]), build(reviews.iloc[1_000:]))
+        pd.testing.assert_frame_equal(merged, build(reviews), check_dtype=False)
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from benchmarks.synthetic import load_flat_keywords
+from scripts.runnner import THEME_KEYWORDS_JSON
+from scripts.theme_extraction import build_keyword_index
+from scripts.vocab_cache import (
+    compiled_vocabulary_source,
+    load_compiled_vocabulary,
+    read_compiled_vocabulary,
+)
+
+
+def test_cache_dir_is_used(tmp_path):
+    source = compiled_vocabulary_source(THEME_KEYWORDS_JSON, build_keyword_index, cache_dir=tmp_path)
+
+    assert isinstance(source, Path) and source.parent == tmp_path
+    assert read_compiled_vocabulary(source)["phrase_keywords"]
+
+
+def test_unwritable_cache_dir_compiles_in_memory(tmp_path):
+    blocked = tmp_path / "not_a_dir"
+    blocked.write_text("")
+
+    source = compiled_vocabulary_source(THEME_KEYWORDS_JSON, build_keyword_index, cache_dir=blocked / "cache")
+    loaded = load_compiled_vocabulary(THEME_KEYWORDS_JSON, build_keyword_index, cache_dir=blocked / "cache")
+
+    assert isinstance(source, dict)
+    assert source["token_index"] == loaded["token_index"]
+    assert source["phrase_keywords"] == build_keyword_index(load_flat_keywords())["phrase_keywords"]
+
+
+def test_cache_key_only_covers_builder_sources(tmp_path, monkeypatch):
+    from scripts import vocab_cache
+
+    sources = [p.name for p in vocab_cache.builder_source_files(build_keyword_index.__module__)]
+    assert sources == ["theme_extraction.py", "phrase_matcher.py"]
+
+    before = compiled_vocabulary_source(THEME_KEYWORDS_JSON, build_keyword_index, cache_dir=tmp_path)
+    monkeypatch.setattr(vocab_cache, "VOCAB_CACHE_VERSION", vocab_cache.VOCAB_CACHE_VERSION + 1)
+    vocab_cache._builder_source_digest.cache_clear()
+    try:
+        after = compiled_vocabulary_source(THEME_KEYWORDS_JSON, build_keyword_index, cache_dir=tmp_path)
+    finally:
+        vocab_cache._builder_source_digest.cache_clear()
+    assert after != before